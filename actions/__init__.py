@@ -5,6 +5,7 @@ from .action_show_product_detail import ActionShowProductDetail
 from .action_default_fallback import ActionDefaultFallback
 from .action_list_products_api import ActionListProductsAPI
 from .action_check_order_status import ActionCheckOrderStatus
+from .action_show_next_page import ActionShowNextPage
 
 __all__ = [
     "ActionSearchProductAPI",
@@ -13,5 +14,6 @@ __all__ = [
     "ActionShowProductDetail",
     "ActionDefaultFallback",
     "ActionListProductsAPI",
-    "ActionCheckOrderStatus"
+    "ActionCheckOrderStatus",
+    "ActionShowNextPage"
 ]
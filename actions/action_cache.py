@@ -0,0 +1,108 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Text, Tuple
+from .action_metrics import CACHE_REQUESTS
+
+
+class TTLCache:
+    """Cache in-process dengan TTL dan stale-while-revalidate.
+
+    Entri yang lebih tua dari `ttl` tetapi masih dalam jendela `stale_ttl`
+    langsung dikembalikan, sementara satu refresh berjalan di background.
+    Dengan `max_entries`, entri yang paling lama disimpan dibuang lebih dulu
+    begitu batas terlampaui.
+    """
+
+    def __init__(
+        self, name: Text, ttl: float, stale_ttl: float = 0.0, max_entries: Optional[int] = None
+    ) -> None:
+        self.name = name
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._refreshing: Dict[Hashable, asyncio.Task] = {}
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, value = entry
+        if time.monotonic() - stored_at > self.ttl + self.stale_ttl:
+            del self._entries[key]
+            return None
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        # Hapus dulu agar key pindah ke akhir urutan sisip dict.
+        self._entries.pop(key, None)
+        self._entries[key] = (time.monotonic(), value)
+        if self.max_entries is not None and len(self._entries) > self.max_entries:
+            del self._entries[next(iter(self._entries))]
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    async def refresh(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        should_cache: Callable[[Any], bool] = lambda value: True,
+    ) -> Any:
+        """Muat ulang `key` tanpa melihat umur entri; entri lama dipertahankan jika hasil tidak layak cache."""
+        value = await loader()
+        if should_cache(value):
+            self.set(key, value)
+        return value
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        should_cache: Callable[[Any], bool] = lambda value: True,
+    ) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None:
+            stored_at, value = entry
+            age = time.monotonic() - stored_at
+            if age <= self.ttl:
+                CACHE_REQUESTS.inc(self.name, "hit")
+                return value
+            if age <= self.ttl + self.stale_ttl:
+                CACHE_REQUESTS.inc(self.name, "stale")
+                self._schedule_refresh(key, loader, should_cache)
+                return value
+            del self._entries[key]
+
+        CACHE_REQUESTS.inc(self.name, "miss")
+        value = await loader()
+        if should_cache(value):
+            self.set(key, value)
+        return value
+
+    def _schedule_refresh(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        should_cache: Callable[[Any], bool],
+    ) -> None:
+        if key in self._refreshing:
+            return
+        task = asyncio.create_task(self._refresh(key, loader, should_cache))
+        self._refreshing[key] = task
+        task.add_done_callback(lambda _: self._refreshing.pop(key, None))
+
+    async def _refresh(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        should_cache: Callable[[Any], bool],
+    ) -> None:
+        try:
+            await self.refresh(key, loader, should_cache)
+        except Exception as e:
+            print(
+                f"Cache '{self.name}': refresh background untuk '{key}' gagal, data lama tetap dipakai: {e}")
@@ -0,0 +1,220 @@
+import urllib.parse
+from typing import Any, Dict, Iterable, List, Optional, Text, Type
+from .action_cache import TTLCache
+from .action_constants import (
+    API_ROOT_URL,
+    CATALOG_CACHE_STALE_TTL,
+    CATALOG_CACHE_TTL,
+    PRODUCT_DETAIL_CACHE_TTL,
+    SEARCH_CACHE_MAX_ENTRIES,
+    SEARCH_CACHE_TTL,
+    SEARCH_NEGATIVE_CACHE_TTL,
+)
+from .action_http_client import ApiResponse, fetch_json
+from .action_metrics import CACHE_REQUESTS
+from .action_models import Product, Shop
+from .action_search_index import TrigramIndex, canonical_query, normalize_text
+
+PRODUCTS_KEY = "products"
+RECOMMENDATIONS_KEY = "recommendations"
+SHOPS_KEY = "shops"
+
+catalog_cache = TTLCache(
+    "catalog", ttl=CATALOG_CACHE_TTL, stale_ttl=CATALOG_CACHE_STALE_TTL)
+
+product_detail_cache = TTLCache("product_detail", ttl=PRODUCT_DETAIL_CACHE_TTL)
+
+search_cache = TTLCache(
+    "search", ttl=SEARCH_CACHE_TTL, max_entries=SEARCH_CACHE_MAX_ENTRIES)
+negative_search_cache = TTLCache(
+    "search_negative", ttl=SEARCH_NEGATIVE_CACHE_TTL, max_entries=SEARCH_CACHE_MAX_ENTRIES)
+
+_product_ids: Dict[Text, Text] = {}
+_product_index: Optional[TrigramIndex] = None
+_product_index_source: Optional[ApiResponse] = None
+
+
+def _is_cacheable(result: ApiResponse) -> bool:
+    return result.status == 200 and isinstance(result.data, dict) and bool(result.data.get("success"))
+
+
+def with_models(result: ApiResponse, key: Text, model: Type[Any]) -> ApiResponse:
+    """Salinan `result` dengan `data.<key>` di-decode menjadi list model.
+
+    Dipanggil sekali saat respons diambil sehingga entri cache sudah berisi
+    model dan action tidak perlu memetakan ulang dict mentah di setiap giliran.
+    """
+    payload = result.data.get("data")
+    if not isinstance(payload, dict) or key not in payload:
+        return result
+    decoded = [model.from_api(raw) for raw in payload[key] or []]
+    return result._replace(data={**result.data, "data": {**payload, key: decoded}})
+
+
+def remember_products(products: Iterable[Product]) -> None:
+    """Catat pemetaan nama produk (dinormalisasi) ke ID dari respons API mana pun."""
+    for product in products:
+        name = normalize_text(product.name)
+        if product.id and name:
+            _product_ids[name] = product.id
+
+
+def resolve_product_id(product_name: Text) -> Optional[Text]:
+    return _product_ids.get(normalize_text(product_name))
+
+
+def _revalidate(key: Text) -> Optional[ApiResponse]:
+    # Entri cache (segar atau basi) dipakai sebagai dasar conditional GET.
+    return catalog_cache.get(key)
+
+
+async def _fetch_products() -> ApiResponse:
+    cached = _revalidate(PRODUCTS_KEY)
+    result = await fetch_json(f"{API_ROOT_URL}/product", cached=cached)
+    if result is not cached and _is_cacheable(result):
+        result = with_models(result, "products", Product)
+        remember_products(result.data.get("data", {}).get("products") or [])
+    return result
+
+
+async def _fetch_recommendations() -> ApiResponse:
+    cached = _revalidate(RECOMMENDATIONS_KEY)
+    result = await fetch_json(f"{API_ROOT_URL}/product/recommendations", cached=cached)
+    if result is not cached and _is_cacheable(result):
+        result = with_models(result, "recommendations", Product)
+        remember_products(result.data.get(
+            "data", {}).get("recommendations") or [])
+    return result
+
+
+async def get_products() -> ApiResponse:
+    """Seluruh katalog dari `GET /product`, dilayani dari cache bila masih segar."""
+    return await catalog_cache.get_or_load(PRODUCTS_KEY, _fetch_products, _is_cacheable)
+
+
+async def get_recommendations() -> ApiResponse:
+    """Hasil `GET /product/recommendations`, dilayani dari cache bila masih segar."""
+    return await catalog_cache.get_or_load(RECOMMENDATIONS_KEY, _fetch_recommendations, _is_cacheable)
+
+
+async def _fetch_shops() -> ApiResponse:
+    cached = _revalidate(SHOPS_KEY)
+    result = await fetch_json(f"{API_ROOT_URL}/shop", cached=cached)
+    if result is not cached and _is_cacheable(result):
+        result = with_models(result, "shops", Shop)
+    return result
+
+
+async def get_shops() -> ApiResponse:
+    """Seluruh direktori toko dari `GET /shop`, dilayani dari cache bila masih segar."""
+    return await catalog_cache.get_or_load(SHOPS_KEY, _fetch_shops, _is_cacheable)
+
+
+async def get_product_detail(product_id: Text) -> ApiResponse:
+    """Hasil `GET /product/{id}`, dilayani dari cache detail bila masih segar."""
+    async def _fetch_detail() -> ApiResponse:
+        return await fetch_json(f"{API_ROOT_URL}/product/{product_id}")
+
+    return await product_detail_cache.get_or_load(product_id, _fetch_detail, _is_cacheable)
+
+
+# Key katalog -> (path endpoint, parameter pencarian, model hasil).
+_SEARCH_ENDPOINTS = {
+    PRODUCTS_KEY: ("product", "searchByName", Product),
+    SHOPS_KEY: ("shop", "searchByShopName", Shop),
+}
+
+
+def search_url(key: Text, search_term: Text) -> Text:
+    """URL pencarian upstream untuk `search_term` apa adanya (hanya di-trim).
+
+    Bentuk kanonik hanya dipakai sebagai key cache hasil yang ditemukan:
+    tanda baca seperti "-" dan kata seperti "yang" bisa jadi bagian nama
+    produk di upstream.
+    """
+    path, param, _ = _SEARCH_ENDPOINTS[key]
+    return f"{API_ROOT_URL}/{path}?{param}={urllib.parse.quote_plus(search_term.strip())}"
+
+
+def _search_hits(result: ApiResponse, key: Text) -> List[Any]:
+    return result.data.get("data", {}).get(key) or []
+
+
+async def _search_upstream(key: Text, search_term: Text) -> ApiResponse:
+    # Varian penulisan ("Ayam Bakar Madu", "ayam bakar madu!") berbagi entri
+    # cache hasil yang ditemukan. Hasil kosong hanya berlaku untuk kueri persis
+    # yang dikirim ke upstream: "ayam bakar rica rica" bisa kosong sementara
+    # "Ayam Bakar Rica-Rica" menemukan produknya.
+    cache_key = (key, canonical_query(search_term))
+    negative_key = (key, search_term.strip().casefold())
+    negative = negative_search_cache.get(negative_key)
+    if negative is not None:
+        CACHE_REQUESTS.inc(negative_search_cache.name, "hit")
+        return negative
+
+    async def _fetch() -> ApiResponse:
+        result = await fetch_json(search_url(key, search_term))
+        if _is_cacheable(result):
+            result = with_models(result, key, _SEARCH_ENDPOINTS[key][2])
+            if key == PRODUCTS_KEY:
+                remember_products(_search_hits(result, key))
+            if not _search_hits(result, key):
+                negative_search_cache.set(negative_key, result)
+        return result
+
+    return await search_cache.get_or_load(
+        cache_key, _fetch,
+        lambda result: _is_cacheable(result) and bool(_search_hits(result, key)))
+
+
+async def search_products_upstream(search_term: Text) -> ApiResponse:
+    """`GET /product?searchByName=`, di-cache per kueri kanonik; hasil kosong di-cache per kueri persis, lebih singkat."""
+    return await _search_upstream(PRODUCTS_KEY, search_term)
+
+
+async def search_shops_upstream(search_term: Text) -> ApiResponse:
+    """`GET /shop?searchByShopName=`, di-cache per kueri kanonik; hasil kosong di-cache per kueri persis, lebih singkat."""
+    return await _search_upstream(SHOPS_KEY, search_term)
+
+
+CATALOG_LOADERS = {
+    PRODUCTS_KEY: _fetch_products,
+    RECOMMENDATIONS_KEY: _fetch_recommendations,
+    SHOPS_KEY: _fetch_shops,
+}
+
+
+async def refresh_catalog_entry(key: Text) -> bool:
+    """Ambil ulang satu entri katalog dari upstream; True jika cache berhasil diperbarui."""
+    result = await catalog_cache.refresh(key, CATALOG_LOADERS[key], _is_cacheable)
+    return _is_cacheable(result)
+
+
+def _current_product_index() -> Optional[TrigramIndex]:
+    global _product_index, _product_index_source
+    cached = catalog_cache.get(PRODUCTS_KEY)
+    if cached is None:
+        return None
+    if cached is not _product_index_source:
+        products = cached.data.get("data", {}).get("products") or []
+        _product_index = TrigramIndex(
+            [(product.name, product) for product in products])
+        _product_index_source = cached
+    return _product_index
+
+
+def warm_product_index() -> bool:
+    """Bangun indeks produk dari katalog cache sekarang, bukan saat pencarian pertama."""
+    return _current_product_index() is not None
+
+
+def search_products(search_term: Text) -> List[Product]:
+    """Cari produk berdasarkan nama di indeks lokal yang dibangun dari katalog cache.
+
+    Mengembalikan list kosong jika katalog belum ada di cache (indeks dingin)
+    atau tidak ada nama yang cukup mirip; pemanggil lalu jatuh ke pencarian upstream.
+    """
+    index = _current_product_index()
+    hits = index.search(search_term) if index is not None else []
+    CACHE_REQUESTS.inc("product_index", "hit" if hits else "miss")
+    return hits
@@ -3,7 +3,8 @@ from typing import Any, Text, Dict, List
 from rasa_sdk import Action, Tracker
 from rasa_sdk.executor import CollectingDispatcher
 from rasa_sdk.types import DomainDict
-from .action_constants import API_ROOT_URL
+from .action_orders import get_orders, invalidate_orders
+from .action_resilience import UpstreamUnavailableError
 
 
 class ActionCheckPaymentStatus(Action):
@@ -37,7 +38,6 @@ class ActionCheckPaymentStatus(Action):
         self, dispatcher: CollectingDispatcher, tracker: Tracker, domain: DomainDict
     ) -> List[Dict[Text, Any]]:
 
-        request_url = f"{API_ROOT_URL}/order/all"
         metadata = tracker.latest_message.get("metadata")
         auth_token = None
         if metadata:
@@ -48,103 +48,94 @@ class ActionCheckPaymentStatus(Action):
             print(f"{self.name()}: authToken tidak ditemukan di metadata.")
             return []
 
-        headers = {"Authorization": f"Bearer {auth_token}"}
-        print(f"{self.name()}: Memanggil API {request_url} dengan token.")
+        if metadata.get("refreshOrders"):
+            invalidate_orders(auth_token)
+
+        print(f"{self.name()}: Mengambil daftar pesanan dengan token.")
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(request_url, headers=headers) as response:
-                    if response.status == 200:
-                        response_data = await response.json()
-                        if response_data.get("success"):
-                            orders = response_data.get("data", [])
-                            if orders:
-                                dispatcher.utter_message(
-                                    template="utter_payment_status_intro")
-                                displayed_orders = 0
-                                for order in orders[:5]:
-                                    payment_details = order.get(
-                                        "paymentDetails")
-                                    order_id = order.get(
-                                        "orderId", "ID Tidak Diketahui")
-                                    shop_name = order.get("shopRingkas", {}).get(
-                                        "shopName", "Toko tidak diketahui")
-                                    items_desc_list = [item.get('name', 'item') for item in order.get(
-                                        'items', [])[:2]]
-                                    items_desc = ", ".join(items_desc_list)
-                                    if len(order.get('items', [])) > 2:
-                                        items_desc += " dll."
-
-                                    message_parts = [
-                                        f"- Pesanan **{order_id}** di **{shop_name}** ({items_desc}):"
-                                    ]
-
-                                    if payment_details:
-                                        method = payment_details.get(
-                                            "method", "Metode tidak diketahui")
-                                        status = payment_details.get(
-                                            "status", "Status tidak diketahui")
-
-                                        readable_status = self.translate_payment_status(
-                                            status, method)
-                                        message_parts.append(
-                                            f"  Status Pembayaran: **{readable_status}**")
+            result = await get_orders(auth_token)
+            if result.status == 200:
+                response_data = result.data
+                if response_data.get("success"):
+                    orders = response_data.get("data", [])
+                    if orders:
+                        dispatcher.utter_message(
+                            template="utter_payment_status_intro")
+                        displayed_orders = 0
+                        for order in orders[:5]:
+                            payment_details = order.payment
+                            order_id = order.order_id or "ID Tidak Diketahui"
+                            items_desc = ", ".join(order.item_names[:2])
+                            if len(order.item_names) > 2:
+                                items_desc += " dll."
+
+                            message_parts = [
+                                f"- Pesanan **{order_id}** di **{order.shop_name}** ({items_desc}):"
+                            ]
+
+                            if payment_details:
+                                method = payment_details.method
+                                status = payment_details.status
+
+                                readable_status = self.translate_payment_status(
+                                    status, method)
+                                message_parts.append(
+                                    f"  Status Pembayaran: **{readable_status}**")
+                                message_parts.append(
+                                    f"  Metode: {method.replace('_', ' ').title()}")
+
+                                if status.lower() == "paid":
+                                    confirmed_at = payment_details.confirmed_at
+                                    if confirmed_at:
                                         message_parts.append(
-                                            f"  Metode: {method.replace('_', ' ').title()}")
-
-                                        if status.lower() == "paid":
-                                            confirmed_at = payment_details.get(
-                                                "confirmedAt")
-                                            if confirmed_at:
-                                                message_parts.append(
-                                                    f"  Dikonfirmasi pada: {confirmed_at.split('T')[0]}")
-                                            confirmation_notes = payment_details.get(
-                                                "confirmationNotes")
-                                            if confirmation_notes:
-                                                message_parts.append(
-                                                    f"  Catatan Konfirmasi: {confirmation_notes}")
-
-                                    else:
+                                            f"  Dikonfirmasi pada: {confirmed_at.split('T')[0]}")
+                                    confirmation_notes = payment_details.confirmation_notes
+                                    if confirmation_notes:
                                         message_parts.append(
-                                            "  Detail pembayaran tidak tersedia.")
-
-                                    dispatcher.utter_message(
-                                        text="\n".join(message_parts))
-                                    displayed_orders += 1
+                                            f"  Catatan Konfirmasi: {confirmation_notes}")
 
-                                if displayed_orders == 0 and orders:
-                                    dispatcher.utter_message(
-                                        text="Tidak ada detail pembayaran yang bisa ditampilkan untuk pesanan Anda saat ini.")
-                                elif not orders:
-                                    dispatcher.utter_message(
-                                        template="utter_no_orders_found")
-
-                            else:
-                                dispatcher.utter_message(
-                                    template="utter_no_orders_found")
-
-                        else:
-                            error_message_from_api = response_data.get(
-                                "message", "Gagal mengambil data pesanan.")
-                            print(
-                                f"{self.name()}: API success=false, message: {error_message_from_api}")
-                            if "Akses ditolak" in error_message_from_api or "Token tidak disertakan" in error_message_from_api:
-                                dispatcher.utter_message(
-                                    template="utter_auth_error")
                             else:
-                                dispatcher.utter_message(
-                                    text=f"Info dari server: {error_message_from_api}")
-
-                    elif response.status == 401 or response.status == 403:
-                        print(
-                            f"{self.name()}: API returned {response.status} (Unauthorized/Forbidden).")
-                        dispatcher.utter_message(template="utter_auth_error")
-                        error_text = await response.text()
-                        print(
-                            f"{self.name()}: API request failed with status: {response.status}, response: {error_text}")
-                        dispatcher.utter_message(template="utter_api_error")
-
-        except aiohttp.ClientConnectorError as e:
+                                message_parts.append(
+                                    "  Detail pembayaran tidak tersedia.")
+
+                            dispatcher.utter_message(
+                                text="\n".join(message_parts))
+                            displayed_orders += 1
+
+                        if displayed_orders == 0 and orders:
+                            dispatcher.utter_message(
+                                text="Tidak ada detail pembayaran yang bisa ditampilkan untuk pesanan Anda saat ini.")
+                        elif not orders:
+                            dispatcher.utter_message(
+                                template="utter_no_orders_found")
+
+                    else:
+                        dispatcher.utter_message(
+                            template="utter_no_orders_found")
+
+                else:
+                    error_message_from_api = response_data.get(
+                        "message", "Gagal mengambil data pesanan.")
+                    print(
+                        f"{self.name()}: API success=false, message: {error_message_from_api}")
+                    if "Akses ditolak" in error_message_from_api or "Token tidak disertakan" in error_message_from_api:
+                        dispatcher.utter_message(
+                            template="utter_auth_error")
+                    else:
+                        dispatcher.utter_message(
+                            text=f"Info dari server: {error_message_from_api}")
+
+            elif result.status == 401 or result.status == 403:
+                print(
+                    f"{self.name()}: API returned {result.status} (Unauthorized/Forbidden).")
+                dispatcher.utter_message(template="utter_auth_error")
+                error_text = result.text
+                print(
+                    f"{self.name()}: API request failed with status: {result.status}, response: {error_text}")
+                dispatcher.utter_message(template="utter_api_error")
+
+        except (aiohttp.ClientConnectorError, UpstreamUnavailableError) as e:
             print(f"{self.name()}: Connection Error: {e}")
             dispatcher.utter_message(
                 text="Maaf, tidak dapat terhubung ke layanan pesanan.")
@@ -13,3 +13,68 @@ if not API_ROOT_URL:
         "Pastikan variabel ini sudah diatur di file .env Anda dan file .env sudah dimuat dengan benar."
     )
     print(error_message)
+
+HTTP_POOL_LIMIT = int(os.getenv("HTTP_POOL_LIMIT", "100"))
+HTTP_POOL_LIMIT_PER_HOST = int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", "30"))
+HTTP_DNS_CACHE_TTL = int(os.getenv("HTTP_DNS_CACHE_TTL", "300"))
+HTTP_KEEPALIVE_TIMEOUT = float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", "30"))
+
+CATALOG_CACHE_TTL = float(os.getenv("CATALOG_CACHE_TTL", "300"))
+CATALOG_CACHE_STALE_TTL = float(os.getenv("CATALOG_CACHE_STALE_TTL", "3600"))
+PRODUCT_DETAIL_CACHE_TTL = float(os.getenv("PRODUCT_DETAIL_CACHE_TTL", "120"))
+SEARCH_CACHE_TTL = float(os.getenv("SEARCH_CACHE_TTL", "120"))
+# Pencarian tanpa hasil ("pizza") di-cache lebih singkat agar produk baru cepat muncul.
+SEARCH_NEGATIVE_CACHE_TTL = float(os.getenv("SEARCH_NEGATIVE_CACHE_TTL", "30"))
+SEARCH_CACHE_MAX_ENTRIES = int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "1000"))
+CATALOG_REFRESH_INTERVAL = float(os.getenv("CATALOG_REFRESH_INTERVAL", "240"))
+CATALOG_WARMUP_RETRY_INTERVAL = float(
+    os.getenv("CATALOG_WARMUP_RETRY_INTERVAL", "5"))
+CATALOG_WARMUP_READY_TIMEOUT = float(
+    os.getenv("CATALOG_WARMUP_READY_TIMEOUT", "60"))
+ORDER_SNAPSHOT_TTL = float(os.getenv("ORDER_SNAPSHOT_TTL", "30"))
+ORDER_FETCH_LIMIT = int(os.getenv("ORDER_FETCH_LIMIT", "5"))
+ORDER_API_SUPPORTS_PAGINATION = os.getenv(
+    "ORDER_API_SUPPORTS_PAGINATION", "false").lower() == "true"
+
+
+def _parse_timeout_map(raw: str) -> dict:
+    """Format: "/order/all=2:10,/product=1.5:5" -> {endpoint: (connect, read)}."""
+    timeouts = {}
+    for item in filter(None, (part.strip() for part in raw.split(","))):
+        endpoint, _, values = item.partition("=")
+        connect, _, read = values.partition(":")
+        timeouts[endpoint.strip()] = (float(connect), float(read or connect))
+    return timeouts
+
+
+def _parse_bulkhead_map(raw: str) -> dict:
+    """Format: "/order/all=8:16,/product=20" -> {endpoint: (concurrency, queue)}."""
+    bulkheads = {}
+    for item in filter(None, (part.strip() for part in raw.split(","))):
+        endpoint, _, values = item.partition("=")
+        concurrency, _, queue = values.partition(":")
+        bulkheads[endpoint.strip()] = (
+            int(concurrency), int(queue) if queue else HTTP_BULKHEAD_QUEUE)
+    return bulkheads
+
+
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "3"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "8"))
+HTTP_ENDPOINT_TIMEOUTS = _parse_timeout_map(os.getenv("HTTP_ENDPOINT_TIMEOUTS", ""))
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "2"))
+HTTP_RETRY_BACKOFF_BASE = float(os.getenv("HTTP_RETRY_BACKOFF_BASE", "0.1"))
+HTTP_RETRY_BACKOFF_MAX = float(os.getenv("HTTP_RETRY_BACKOFF_MAX", "1.0"))
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+CIRCUIT_RESET_TIMEOUT = float(os.getenv("CIRCUIT_RESET_TIMEOUT", "30"))
+# Bulkhead per route upstream: jumlah request bersamaan dan antrean maksimum.
+# Route order dibatasi lebih ketat agar /order/all yang lambat tidak memakai
+# habis pool koneksi (HTTP_POOL_LIMIT_PER_HOST) milik route katalog.
+HTTP_BULKHEAD_CONCURRENCY = int(os.getenv("HTTP_BULKHEAD_CONCURRENCY", "20"))
+HTTP_BULKHEAD_QUEUE = int(os.getenv("HTTP_BULKHEAD_QUEUE", "50"))
+HTTP_ENDPOINT_BULKHEADS = _parse_bulkhead_map(
+    os.getenv("HTTP_ENDPOINT_BULKHEADS", "/order/all=8:16"))
+LISTING_PAGE_SIZE = int(os.getenv("LISTING_PAGE_SIZE", "10"))
+PRODUCT_DETAIL_BATCH_CONCURRENCY = int(
+    os.getenv("PRODUCT_DETAIL_BATCH_CONCURRENCY", "4"))
+PRODUCT_DETAIL_BATCH_MAX_ITEMS = int(
+    os.getenv("PRODUCT_DETAIL_BATCH_MAX_ITEMS", "5"))
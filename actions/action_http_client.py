@@ -0,0 +1,339 @@
+import asyncio
+import hashlib
+import re
+import time
+import urllib.parse
+import aiohttp
+from typing import Any, Dict, NamedTuple, Optional, Set, Text, Tuple
+from .action_constants import (
+    API_ROOT_URL,
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_DNS_CACHE_TTL,
+    HTTP_ENDPOINT_TIMEOUTS,
+    HTTP_KEEPALIVE_TIMEOUT,
+    HTTP_MAX_RETRIES,
+    HTTP_POOL_LIMIT,
+    HTTP_POOL_LIMIT_PER_HOST,
+    HTTP_READ_TIMEOUT,
+)
+from .action_json import JSON_DECODER, loads as json_loads
+from .action_json_stream import read_bounded_json
+from .action_metrics import CIRCUIT_OPEN, UPSTREAM_ERRORS, UPSTREAM_LATENCY, UPSTREAM_RETRIES
+from .action_resilience import (
+    CLOSED,
+    HALF_OPEN,
+    CircuitBreaker,
+    UpstreamUnavailableError,
+    backoff_delay,
+    get_bulkhead,
+    get_circuit_breaker,
+)
+
+try:
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        ACCEPT_ENCODING = "gzip, deflate, br"
+    except ImportError:
+        # aiohttp hanya bisa mendekode br jika paket Brotli terpasang.
+        ACCEPT_ENCODING = "gzip, deflate"
+
+_session: Optional[aiohttp.ClientSession] = None
+_session_loop: Optional[asyncio.AbstractEventLoop] = None
+_closing_sessions: Set["asyncio.Task[None]"] = set()
+
+
+def _create_session() -> aiohttp.ClientSession:
+    connector = aiohttp.TCPConnector(
+        limit=HTTP_POOL_LIMIT,
+        limit_per_host=HTTP_POOL_LIMIT_PER_HOST,
+        ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+        keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+    )
+    return aiohttp.ClientSession(
+        connector=connector, headers={"Accept-Encoding": ACCEPT_ENCODING})
+
+
+def get_session() -> aiohttp.ClientSession:
+    """Mengembalikan ClientSession bersama milik action server.
+
+    Session dibuat sekali per event loop dan dipakai ulang oleh semua action
+    sehingga koneksi keep-alive ke API_ROOT_URL tetap hangat antar giliran.
+    """
+    global _session, _session_loop
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _session_loop is not loop:
+        if _session is not None and _session_loop is not None:
+            _retire_session(_session, _session_loop)
+        _session = _create_session()
+        _session_loop = loop
+    return _session
+
+
+def _retire_session(session: aiohttp.ClientSession, loop: asyncio.AbstractEventLoop) -> None:
+    """Tutup session milik event loop lama agar connector-nya tidak bocor."""
+    if session.closed:
+        return
+    if loop.is_running():
+        # Loop lama masih berjalan di thread lain: tutup di loop itu sendiri.
+        asyncio.run_coroutine_threadsafe(session.close(), loop)
+        return
+    # Loop lama sudah berhenti: koneksinya ditutup dan session ditandai
+    # selesai dari loop yang sekarang, di background.
+    task = asyncio.get_running_loop().create_task(session.close())
+    _closing_sessions.add(task)
+    task.add_done_callback(_forget_closing_session)
+
+
+def _forget_closing_session(task: "asyncio.Task[None]") -> None:
+    _closing_sessions.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        print(f"Session HTTP lama gagal ditutup: {task.exception()}")
+
+
+async def start_http_client() -> None:
+    get_session()
+    print(
+        f"HTTP client siap (limit={HTTP_POOL_LIMIT}, limit_per_host={HTTP_POOL_LIMIT_PER_HOST}, "
+        f"dns_cache={HTTP_DNS_CACHE_TTL}s, accept_encoding={ACCEPT_ENCODING}, json={JSON_DECODER}).")
+
+
+async def close_http_client() -> None:
+    global _session, _session_loop
+    if _session is not None and not _session.closed:
+        await _session.close()
+        print("HTTP client ditutup.")
+    _session = None
+    _session_loop = None
+
+
+class ApiResponse(NamedTuple):
+    status: int
+    data: Any = None
+    text: Optional[Text] = None
+    etag: Optional[Text] = None
+    last_modified: Optional[Text] = None
+
+
+def _conditional_headers(
+    headers: Optional[Dict[Text, Text]], cached: Optional[ApiResponse]
+) -> Optional[Dict[Text, Text]]:
+    if cached is None or (cached.etag is None and cached.last_modified is None):
+        return headers
+    conditional = dict(headers or {})
+    if cached.etag is not None:
+        conditional["If-None-Match"] = cached.etag
+    if cached.last_modified is not None:
+        conditional["If-Modified-Since"] = cached.last_modified
+    return conditional
+
+
+_inflight: Dict[Tuple[Any, ...], "asyncio.Future[ApiResponse]"] = {}
+
+
+_ID_SEGMENT = re.compile(r"^(?=.*\d)[0-9A-Za-z_-]+$")
+
+
+def endpoint_label(url: Text) -> Text:
+    """Path upstream tanpa API_ROOT_URL dan query, dengan segmen ID diganti `{id}`."""
+    path = urllib.parse.urlsplit(url).path
+    root_path = urllib.parse.urlsplit(API_ROOT_URL or "").path.rstrip("/")
+    if root_path and path.startswith(root_path):
+        path = path[len(root_path):]
+    segments = ["{id}" if _ID_SEGMENT.match(segment) else segment
+                for segment in path.split("/")]
+    return "/".join(segments) or "/"
+
+
+def _auth_scope(headers: Optional[Dict[Text, Text]]) -> Text:
+    authorization = (headers or {}).get("Authorization")
+    if not authorization:
+        return ""
+    return hashlib.sha256(authorization.encode("utf-8")).hexdigest()
+
+
+RETRYABLE_STATUSES = frozenset({502, 503, 504})
+
+
+def _timeout_for(endpoint: Text) -> aiohttp.ClientTimeout:
+    connect, read = HTTP_ENDPOINT_TIMEOUTS.get(
+        endpoint, (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT))
+    # sock_connect, bukan connect: `connect` juga menghitung waktu menunggu
+    # koneksi kosong di pool, sehingga pool yang penuh saat ramai akan tampak
+    # seperti backend gagal dan ikut membuka circuit. Antrean pool sudah
+    # dibatasi bulkhead per route.
+    return aiohttp.ClientTimeout(total=None, sock_connect=connect, sock_read=read)
+
+
+async def _get_json(
+    url: Text,
+    headers: Optional[Dict[Text, Text]],
+    max_items: Optional[int],
+    cached: Optional[ApiResponse] = None,
+) -> ApiResponse:
+    endpoint = endpoint_label(url)
+    # Circuit dicek sebelum mengambil slot bulkhead: circuit yang terbuka
+    # harus langsung gagal, bukan setelah ikut antre di belakang request lain.
+    breaker = get_circuit_breaker(endpoint)
+    if not breaker.allow_request():
+        UPSTREAM_ERRORS.inc(endpoint, "CircuitOpen")
+        raise UpstreamUnavailableError(
+            f"Circuit untuk {endpoint} sedang terbuka, request ditolak.")
+
+    is_probe = breaker.state == HALF_OPEN
+    try:
+        # Slot bulkhead dipegang selama semua percobaan, termasuk jeda backoff,
+        # agar retry tidak ikut menambah beban route yang sedang lambat.
+        async with get_bulkhead(endpoint).slot():
+            return await _get_json_with_retries(url, endpoint, headers, max_items, cached, breaker)
+    finally:
+        # Probe yang berhenti tanpa hasil (mis. CancelledError atau bulkhead
+        # penuh) tidak boleh mengunci circuit di half-open; hasil yang
+        # tercatat sudah melepasnya.
+        if is_probe and breaker.state == HALF_OPEN:
+            breaker.release_probe()
+
+
+async def _get_json_with_retries(
+    url: Text,
+    endpoint: Text,
+    headers: Optional[Dict[Text, Text]],
+    max_items: Optional[int],
+    cached: Optional[ApiResponse],
+    breaker: CircuitBreaker,
+) -> ApiResponse:
+    timeout = _timeout_for(endpoint)
+    attempt = 0
+    while True:
+        started = time.perf_counter()
+        try:
+            result = await _read_json(url, headers, max_items, timeout, cached)
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+            UPSTREAM_ERRORS.inc(endpoint, type(e).__name__)
+            if attempt < HTTP_MAX_RETRIES:
+                attempt += 1
+                UPSTREAM_RETRIES.inc(endpoint)
+                await asyncio.sleep(backoff_delay(attempt))
+                continue
+            _record_outcome(breaker, endpoint, success=False)
+            if isinstance(e, asyncio.TimeoutError):
+                raise UpstreamUnavailableError(
+                    f"Timeout memanggil {endpoint} setelah {attempt + 1} percobaan.") from e
+            raise
+        except Exception as e:
+            # Backend menjawab tetapi isinya bermasalah (mis. bukan JSON):
+            # bukan tanda backend mati, jadi circuit tidak ikut dibuka.
+            UPSTREAM_ERRORS.inc(endpoint, type(e).__name__)
+            _record_outcome(breaker, endpoint, success=True)
+            raise
+
+        status_label = "304" if cached is not None and result is cached else str(result.status)
+        UPSTREAM_LATENCY.observe(time.perf_counter() -
+                                 started, endpoint, status_label)
+        if result.status in RETRYABLE_STATUSES and attempt < HTTP_MAX_RETRIES:
+            attempt += 1
+            UPSTREAM_RETRIES.inc(endpoint)
+            await asyncio.sleep(backoff_delay(attempt))
+            continue
+        _record_outcome(breaker, endpoint, success=result.status < 500)
+        return result
+
+
+def _record_outcome(breaker: CircuitBreaker, endpoint: Text, success: bool) -> None:
+    if success:
+        breaker.record_success()
+    else:
+        breaker.record_failure()
+    CIRCUIT_OPEN.set(0.0 if breaker.state == CLOSED else 1.0, endpoint)
+
+
+def _ensure_json(response: aiohttp.ClientResponse) -> None:
+    if "json" not in response.content_type:
+        raise aiohttp.ContentTypeError(
+            response.request_info,
+            response.history,
+            status=response.status,
+            message=f"Attempt to decode JSON with unexpected mimetype: {response.content_type}",
+            headers=response.headers,
+        )
+
+
+async def _read_json(
+    url: Text,
+    headers: Optional[Dict[Text, Text]],
+    max_items: Optional[int],
+    timeout: aiohttp.ClientTimeout,
+    cached: Optional[ApiResponse] = None,
+) -> ApiResponse:
+    session = get_session()
+    request_headers = _conditional_headers(headers, cached)
+    async with session.get(url, headers=request_headers, timeout=timeout) as response:
+        if response.status == 304 and cached is not None:
+            # Tidak berubah: kembalikan objek cache yang sama agar hasil
+            # parse dan indeks turunannya dipakai ulang.
+            return cached
+        if response.status != 200:
+            return ApiResponse(response.status, text=await response.text())
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        _ensure_json(response)
+        if max_items is None:
+            body = await response.read()
+            data = json_loads(body) if body.strip() else None
+            return ApiResponse(response.status, data, etag=etag, last_modified=last_modified)
+        data, truncated = await read_bounded_json(
+            response.content.iter_chunked(16 * 1024), "data", max_items)
+        if not truncated:
+            return ApiResponse(response.status, data, etag=etag, last_modified=last_modified)
+        # Batas tercapai di tengah array `data`, mungkin sebelum key `success`
+        # terbaca: array yang sudah terkirim dengan status 200 dianggap sukses.
+        data.setdefault("success", True)
+        # Body terpotong tidak boleh dipakai sebagai dasar revalidasi.
+        return ApiResponse(response.status, data)
+
+
+def _forget_inflight(key: Tuple[Any, ...], task: "asyncio.Future[ApiResponse]") -> None:
+    if _inflight.get(key) is task:
+        del _inflight[key]
+    if not task.cancelled():
+        # Tandai exception sudah diambil agar tidak muncul warning bila semua
+        # penunggunya sudah dibatalkan.
+        task.exception()
+
+
+async def fetch_json(
+    url: Text,
+    headers: Optional[Dict[Text, Text]] = None,
+    max_items: Optional[int] = None,
+    cached: Optional[ApiResponse] = None,
+) -> ApiResponse:
+    """GET `url` lewat session bersama.
+
+    Body JSON hanya di-parse untuk status 200; status lain mengembalikan body
+    mentah di `text` agar action bisa mencetaknya seperti sebelumnya.
+
+    GET identik yang berjalan bersamaan (URL dan scope Authorization sama)
+    berbagi satu request upstream beserta hasil parse-nya, jadi hasilnya
+    harus diperlakukan read-only.
+
+    Dengan `max_items`, array `data` di-parse secara streaming dan pembacaan
+    body berhenti setelah `max_items` elemen.
+
+    Dengan `cached` (respons sebelumnya untuk URL yang sama), request dikirim
+    sebagai conditional GET memakai ETag/Last-Modified-nya; jika upstream
+    menjawab 304, objek `cached` itu sendiri yang dikembalikan.
+
+    Tiap route dibatasi bulkhead-nya sendiri (lihat `get_bulkhead`); jika
+    slot dan antreannya penuh, `BulkheadFullError` (turunan
+    `UpstreamUnavailableError`) langsung dilempar.
+    """
+    validators = (cached.etag, cached.last_modified) if cached is not None else None
+    key = (url, _auth_scope(headers), max_items, validators)
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_get_json(url, headers, max_items, cached))
+        _inflight[key] = task
+        task.add_done_callback(lambda done: _forget_inflight(key, done))
+    return await asyncio.shield(task)
@@ -0,0 +1,23 @@
+import json
+from typing import Any, Callable, Text, Union
+
+# Decoder JSON tercepat yang tersedia: orjson, lalu msgspec, lalu stdlib.
+try:
+    import orjson
+
+    JSON_DECODER = "orjson"
+    _loads: Callable[[Union[bytes, Text]], Any] = orjson.loads
+except ImportError:
+    try:
+        import msgspec
+
+        JSON_DECODER = "msgspec"
+        _loads = msgspec.json.Decoder().decode
+    except ImportError:
+        JSON_DECODER = "json"
+        _loads = json.loads
+
+
+def loads(body: Union[bytes, Text]) -> Any:
+    """Decode body JSON (bytes atau str) langsung tanpa decode teks terpisah."""
+    return _loads(body)
@@ -0,0 +1,98 @@
+import codecs
+import json
+from typing import Any, AsyncIterator, Dict, Text, Tuple
+
+_WHITESPACE = " \t\n\r"
+
+
+class _StreamBuffer:
+    def __init__(self, chunks: AsyncIterator[bytes]) -> None:
+        self._chunks = chunks
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    async def fill(self) -> None:
+        if self.eof:
+            raise ValueError("JSON terpotong: stream berakhir sebelum dokumen selesai.")
+        self.text = self.text[self.pos:]
+        self.pos = 0
+        try:
+            chunk = await self._chunks.__anext__()
+            self.text += self._decoder.decode(chunk)
+        except StopAsyncIteration:
+            self.text += self._decoder.decode(b"", final=True)
+            self.eof = True
+
+    async def peek(self) -> Text:
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            await self.fill()
+
+    async def expect(self, char: Text) -> None:
+        if await self.peek() != char:
+            raise ValueError(f"JSON tidak valid: diharapkan '{char}' di posisi {self.pos}.")
+        self.pos += 1
+
+    async def value(self, decoder: json.JSONDecoder) -> Any:
+        await self.peek()
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.text, self.pos)
+                # Nilai yang berakhir tepat di ujung buffer (mis. angka) bisa
+                # saja masih terpotong, jadi baca lagi sebelum menerimanya.
+                if end < len(self.text) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            await self.fill()
+
+
+async def read_bounded_json(
+    chunks: AsyncIterator[bytes], array_key: Text, limit: int
+) -> Tuple[Dict[Text, Any], bool]:
+    """Parse objek JSON top-level secara bertahap dari `chunks`.
+
+    Elemen array `array_key` di-decode satu per satu dan pembacaan berhenti
+    begitu `limit` elemen terkumpul, sehingga sisa body tidak pernah dibaca
+    atau dialokasikan. Key lain yang muncul sebelum titik itu ikut
+    dikembalikan apa adanya. Nilai kedua bernilai True jika pembacaan
+    berhenti di tengah array, yaitu sisa body tidak dibaca.
+    """
+    decoder = json.JSONDecoder()
+    buffer = _StreamBuffer(chunks)
+    result: Dict[Text, Any] = {}
+
+    await buffer.expect("{")
+    while True:
+        char = await buffer.peek()
+        if char == "}":
+            return result, False
+        if char == ",":
+            buffer.pos += 1
+            continue
+        key = await buffer.value(decoder)
+        await buffer.expect(":")
+        if key != array_key or await buffer.peek() != "[":
+            result[key] = await buffer.value(decoder)
+            continue
+
+        items = result[key] = []
+        buffer.pos += 1
+        while True:
+            char = await buffer.peek()
+            if char == "]":
+                buffer.pos += 1
+                break
+            if char == ",":
+                buffer.pos += 1
+                continue
+            items.append(await buffer.value(decoder))
+            if len(items) >= limit:
+                return result, True
@@ -0,0 +1,109 @@
+import hashlib
+import heapq
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Text, Tuple
+from .action_constants import LISTING_PAGE_SIZE
+from .action_models import Product, Shop
+from .action_product_render import render_product_card
+from .action_shop_directory import render_shop_card
+
+LISTING_CURSOR_SLOT = "listing_cursor"
+PRODUCTS_LISTING = "products"
+SHOPS_LISTING = "shops"
+MAX_SNAPSHOTS = 8
+
+_snapshots: "OrderedDict[Tuple[Text, Text], Sequence[Any]]" = OrderedDict()
+_current: Dict[Text, Tuple[Sequence[Any], Text]] = {}
+
+
+def snapshot_id_of(items: Sequence[Any]) -> Text:
+    # Diturunkan dari isi daftar agar cursor tetap valid lintas worker
+    # selama semuanya melihat katalog yang sama.
+    digest = hashlib.blake2b(digest_size=6)
+    for item in items:
+        digest.update(str(item.id or item.name).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def remember_snapshot(kind: Text, items: Sequence[Any]) -> Text:
+    """Simpan daftar yang sedang ditampilkan dan kembalikan ID snapshot-nya."""
+    current = _current.get(kind)
+    if current is not None and current[0] is items:
+        return current[1]
+    snapshot_id = snapshot_id_of(items)
+    _current[kind] = (items, snapshot_id)
+    _snapshots[(kind, snapshot_id)] = items
+    _snapshots.move_to_end((kind, snapshot_id))
+    while len(_snapshots) > MAX_SNAPSHOTS:
+        _snapshots.popitem(last=False)
+    return snapshot_id
+
+
+def get_snapshot(kind: Text, snapshot_id: Text) -> Optional[Sequence[Any]]:
+    return _snapshots.get((kind, snapshot_id))
+
+
+def encode_cursor(kind: Text, snapshot_id: Text, offset: int) -> Text:
+    return f"{kind}:{snapshot_id}:{offset}"
+
+
+def decode_cursor(cursor: Optional[Text]) -> Optional[Tuple[Text, Text, int]]:
+    try:
+        kind, snapshot_id, offset = (cursor or "").split(":")
+        return kind, snapshot_id, int(offset)
+    except ValueError:
+        return None
+
+
+def top_k_page(
+    items: Sequence[Any], offset: int, page_size: int, key: Callable[[Any], Any]
+) -> List[Any]:
+    """Halaman `offset`..`offset + page_size` dari `items` yang diurutkan menurun berdasarkan `key`.
+
+    Memakai seleksi parsial (heapq.nlargest) sehingga hanya elemen sampai
+    halaman yang diminta yang perlu diurutkan; urutan untuk nilai `key`
+    yang sama identik dengan `sorted(..., reverse=True)`.
+    """
+    return heapq.nlargest(offset + page_size, items, key=key)[offset:]
+
+
+def product_rating_key(product: Product) -> Tuple[float, int]:
+    return product.rating_key
+
+
+def _more_line(remaining: int, noun: Text) -> Text:
+    return f"\n...dan {remaining} {noun} lainnya. Ketik \"lagi\" untuk melihat berikutnya."
+
+
+def render_product_page(
+    products: Sequence[Product], offset: int, header: Text
+) -> Tuple[Text, Optional[Text]]:
+    """Render satu halaman daftar produk (rating tertinggi dulu) beserta cursor halaman berikutnya."""
+    page = top_k_page(products, offset, LISTING_PAGE_SIZE, product_rating_key)
+    message_parts = [header]
+    message_parts.extend(render_product_card(product) for product in page)
+
+    next_offset = offset + LISTING_PAGE_SIZE
+    remaining = len(products) - next_offset
+    if remaining <= 0:
+        return "".join(message_parts), None
+    message_parts.append(_more_line(remaining, "produk"))
+    snapshot_id = remember_snapshot(PRODUCTS_LISTING, products)
+    return "".join(message_parts), encode_cursor(PRODUCTS_LISTING, snapshot_id, next_offset)
+
+
+def render_shop_page(
+    shops: Sequence[Shop], offset: int, header: Text
+) -> Tuple[Text, Optional[Text]]:
+    """Render satu halaman direktori toko (sudah terurut nama) beserta cursor halaman berikutnya."""
+    next_offset = offset + LISTING_PAGE_SIZE
+    message_parts = [header]
+    message_parts.extend(render_shop_card(shop) for shop in shops[offset:next_offset])
+
+    remaining = len(shops) - next_offset
+    if remaining <= 0:
+        return "".join(message_parts), None
+    message_parts.append(_more_line(remaining, "toko"))
+    snapshot_id = remember_snapshot(SHOPS_LISTING, shops)
+    return "".join(message_parts), encode_cursor(SHOPS_LISTING, snapshot_id, next_offset)
@@ -0,0 +1,185 @@
+from collections import defaultdict
+from typing import Dict, List, Sequence, Text, Tuple
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1,
+                   0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_registry: List["_Metric"] = []
+
+
+def _escape(value: Text) -> Text:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[Text], values: Sequence[Text], extra: Text = "") -> Text:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: Text, documentation: Text, labelnames: Sequence[Text] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        _registry.append(self)
+
+    def render(self) -> List[Text]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: Text, documentation: Text, labelnames: Sequence[Text] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[Text, ...], float] = defaultdict(float)
+
+    def inc(self, *labels: Text, amount: float = 1.0) -> None:
+        self._values[labels] += amount
+
+    def render(self) -> List[Text]:
+        lines = super().render()
+        for labels, value in sorted(self._values.items()):
+            lines.append(
+                f"{self.name}{_format_labels(self.labelnames, labels)} {value}")
+        return lines
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *labels: Text, amount: float = 1.0) -> None:
+        self._values[labels] -= amount
+
+    def set(self, value: float, *labels: Text) -> None:
+        self._values[labels] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: Text,
+        documentation: Text,
+        labelnames: Sequence[Text] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+        self._counts: Dict[Tuple[Text, ...], List[int]] = {}
+        self._sums: Dict[Tuple[Text, ...], float] = defaultdict(float)
+
+    def observe(self, value: float, *labels: Text) -> None:
+        counts = self._counts.get(labels)
+        if counts is None:
+            counts = self._counts[labels] = [0] * (len(self.buckets) + 1)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[i] += 1
+                break
+        else:
+            counts[-1] += 1
+        self._sums[labels] += value
+
+    def render(self) -> List[Text]:
+        lines = super().render()
+        for labels, counts in sorted(self._counts.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                bucket_labels = _format_labels(
+                    self.labelnames, labels, f'le="{le}"')
+                lines.append(
+                    f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(
+                f"{self.name}_sum{_format_labels(self.labelnames, labels)} {self._sums[labels]}")
+            lines.append(
+                f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+def render_prometheus() -> Text:
+    """Semua metrik proses ini dalam format teks Prometheus (version 0.0.4)."""
+    lines: List[Text] = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+ACTION_LATENCY = Histogram(
+    "action_server_action_latency_seconds",
+    "Latency of /webhook action calls by action name.",
+    ["action"],
+)
+ACTION_REQUESTS = Counter(
+    "action_server_action_requests_total",
+    "Action calls by action name and HTTP status returned to Rasa.",
+    ["action", "status"],
+)
+ACTIONS_IN_FLIGHT = Gauge(
+    "action_server_actions_in_flight",
+    "Action calls currently being executed.",
+    ["action"],
+)
+UPSTREAM_LATENCY = Histogram(
+    "action_server_upstream_request_duration_seconds",
+    "Duration of upstream API calls by endpoint and status code.",
+    ["endpoint", "status"],
+)
+UPSTREAM_ERRORS = Counter(
+    "action_server_upstream_errors_total",
+    "Upstream API calls that raised, by endpoint and exception class.",
+    ["endpoint", "exception"],
+)
+CACHE_REQUESTS = Counter(
+    "action_server_cache_requests_total",
+    "Cache lookups by cache name and result (hit, stale, miss).",
+    ["cache", "result"],
+)
+
+UPSTREAM_RETRIES = Counter(
+    "action_server_upstream_retries_total",
+    "Retried upstream API calls by endpoint.",
+    ["endpoint"],
+)
+CIRCUIT_OPEN = Gauge(
+    "action_server_circuit_open",
+    "1 while the circuit breaker of an upstream route is not closed.",
+    ["endpoint"],
+)
+BULKHEAD_QUEUE_DELAY = Histogram(
+    "action_server_bulkhead_queue_delay_seconds",
+    "Time upstream calls waited for a bulkhead slot, by endpoint.",
+    ["endpoint"],
+)
+BULKHEAD_IN_FLIGHT = Gauge(
+    "action_server_bulkhead_in_flight",
+    "Upstream calls holding a bulkhead slot, by endpoint.",
+    ["endpoint"],
+)
+BULKHEAD_QUEUED = Gauge(
+    "action_server_bulkhead_queued",
+    "Upstream calls waiting for a bulkhead slot, by endpoint.",
+    ["endpoint"],
+)
+BULKHEAD_REJECTIONS = Counter(
+    "action_server_bulkhead_rejections_total",
+    "Upstream calls rejected because the bulkhead and its queue were full.",
+    ["endpoint"],
+)
+CATALOG_REFRESHES = Counter(
+    "action_server_catalog_refresh_total",
+    "Background catalog refreshes by cache key and outcome (ok, failed, error).",
+    ["key", "outcome"],
+)
+ACTION_SERVER_READY = Gauge(
+    "action_server_ready",
+    "1 once the startup catalog warm-up has finished.",
+    [],
+)
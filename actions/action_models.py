@@ -0,0 +1,151 @@
+from typing import Any, Dict, List, Optional, Text, Tuple
+
+
+class Product:
+    """Produk dari `/product` dan `/product/recommendations`.
+
+    Default field diterapkan sekali saat decode, bukan di setiap action.
+    """
+
+    __slots__ = ("id", "name", "price", "description", "stock", "category",
+                 "image_url", "average_rating", "rating_count")
+
+    def __init__(
+        self,
+        id: Optional[Text],
+        name: Text,
+        price: Any,
+        description: Text,
+        stock: Any,
+        category: Text,
+        image_url: Optional[Text],
+        average_rating: float,
+        rating_count: int,
+    ) -> None:
+        self.id = id
+        self.name = name
+        self.price = price
+        self.description = description
+        self.stock = stock
+        self.category = category
+        self.image_url = image_url
+        self.average_rating = average_rating
+        self.rating_count = rating_count
+
+    @classmethod
+    def from_api(cls, raw: Dict[Text, Any]) -> "Product":
+        return cls(
+            id=raw.get("_id"),
+            name=raw.get("name", "Nama tidak tersedia"),
+            price=raw.get("price", "Harga tidak tersedia"),
+            description=raw.get("description", ""),
+            stock=raw.get("stock", "Tidak diketahui"),
+            category=raw.get("category", "Tidak diketahui"),
+            image_url=raw.get("productImageURL"),
+            average_rating=raw.get("averageRating", 0.0),
+            rating_count=raw.get("ratingCount", 0),
+        )
+
+    @property
+    def rating_key(self) -> Tuple[float, int]:
+        return (self.average_rating, self.rating_count)
+
+
+class Shop:
+    """Toko dari `/shop`."""
+
+    __slots__ = ("id", "name", "address", "description", "banner_image_url", "owner_name")
+
+    def __init__(
+        self,
+        id: Optional[Text],
+        name: Text,
+        address: Text,
+        description: Text,
+        banner_image_url: Optional[Text],
+        owner_name: Text,
+    ) -> None:
+        self.id = id
+        self.name = name
+        self.address = address
+        self.description = description
+        self.banner_image_url = banner_image_url
+        self.owner_name = owner_name
+
+    @classmethod
+    def from_api(cls, raw: Dict[Text, Any]) -> "Shop":
+        return cls(
+            id=raw.get("_id"),
+            name=raw.get("shopName", "Nama toko tidak tersedia"),
+            address=raw.get("shopAddress", "Alamat tidak tersedia"),
+            description=raw.get("description", "Tidak ada deskripsi"),
+            banner_image_url=raw.get("bannerImageURL"),
+            owner_name=raw.get("ownerName", "Nama pemilik tidak diketahui"),
+        )
+
+
+class PaymentDetails:
+    """`paymentDetails` sebuah pesanan."""
+
+    __slots__ = ("method", "status", "confirmed_at", "confirmation_notes")
+
+    def __init__(
+        self,
+        method: Text,
+        status: Text,
+        confirmed_at: Optional[Text],
+        confirmation_notes: Optional[Text],
+    ) -> None:
+        self.method = method
+        self.status = status
+        self.confirmed_at = confirmed_at
+        self.confirmation_notes = confirmation_notes
+
+    @classmethod
+    def from_api(cls, raw: Optional[Dict[Text, Any]]) -> Optional["PaymentDetails"]:
+        # Objek kosong/null diperlakukan sama: detail pembayaran tidak ada.
+        if not raw:
+            return None
+        return cls(
+            method=raw.get("method", "Metode tidak diketahui"),
+            status=raw.get("status", "Status tidak diketahui"),
+            confirmed_at=raw.get("confirmedAt"),
+            confirmation_notes=raw.get("confirmationNotes"),
+        )
+
+
+class Order:
+    """Pesanan dari `/order/all`."""
+
+    __slots__ = ("order_id", "order_status", "total_price", "item_names",
+                 "shop_name", "created_at", "payment")
+
+    def __init__(
+        self,
+        order_id: Optional[Text],
+        order_status: Text,
+        total_price: Any,
+        item_names: List[Text],
+        shop_name: Text,
+        created_at: Text,
+        payment: Optional[PaymentDetails],
+    ) -> None:
+        self.order_id = order_id
+        self.order_status = order_status
+        self.total_price = total_price
+        self.item_names = item_names
+        self.shop_name = shop_name
+        self.created_at = created_at
+        self.payment = payment
+
+    @classmethod
+    def from_api(cls, raw: Dict[Text, Any]) -> "Order":
+        return cls(
+            order_id=raw.get("orderId"),
+            order_status=raw.get("orderStatus", "Status Tidak Diketahui"),
+            total_price=raw.get("totalPrice"),
+            item_names=[item.get("name", "item") for item in raw.get("items", [])],
+            shop_name=raw.get("shopRingkas", {}).get("shopName", "Toko tidak diketahui"),
+            created_at=raw.get("createdAt", ""),
+            payment=PaymentDetails.from_api(raw.get("paymentDetails")),
+        )
@@ -0,0 +1,51 @@
+import hashlib
+from typing import Optional, Text
+from .action_cache import TTLCache
+from .action_constants import (
+    API_ROOT_URL,
+    ORDER_API_SUPPORTS_PAGINATION,
+    ORDER_FETCH_LIMIT,
+    ORDER_SNAPSHOT_TTL,
+)
+from .action_http_client import ApiResponse, fetch_json
+from .action_models import Order
+
+order_snapshot_cache = TTLCache("order_snapshot", ttl=ORDER_SNAPSHOT_TTL)
+
+
+def _token_key(auth_token: Text) -> Text:
+    # Token mentah tidak pernah disimpan sebagai key cache.
+    return hashlib.sha256(auth_token.encode("utf-8")).hexdigest()
+
+
+def _is_cacheable(result: ApiResponse) -> bool:
+    return result.status == 200 and isinstance(result.data, dict) and bool(result.data.get("success"))
+
+
+async def get_orders(auth_token: Text) -> ApiResponse:
+    """Snapshot `GET /order/all` milik pemegang token, dibagi antara action pesanan dan pembayaran.
+
+    Hanya `ORDER_FETCH_LIMIT` pesanan pertama yang diambil: lewat query
+    `limit`/`page` jika upstream mendukungnya, selain itu dengan membaca
+    array pesanan secara streaming dan berhenti setelah batas tercapai.
+    Pada respons sukses, `data` berisi list `Order`.
+    """
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    request_url = f"{API_ROOT_URL}/order/all"
+    if ORDER_API_SUPPORTS_PAGINATION:
+        request_url += f"?limit={ORDER_FETCH_LIMIT}&page=1"
+
+    async def _fetch_orders() -> ApiResponse:
+        result = await fetch_json(request_url, headers=headers, max_items=ORDER_FETCH_LIMIT)
+        if _is_cacheable(result) and isinstance(result.data.get("data"), list):
+            result = result._replace(data={
+                **result.data, "data": [Order.from_api(order) for order in result.data["data"]]})
+        return result
+
+    return await order_snapshot_cache.get_or_load(_token_key(auth_token), _fetch_orders, _is_cacheable)
+
+
+def invalidate_orders(auth_token: Optional[Text] = None) -> None:
+    """Buang snapshot pesanan milik token tertentu, atau semua snapshot jika token kosong."""
+    order_snapshot_cache.invalidate(
+        _token_key(auth_token) if auth_token else None)
@@ -0,0 +1,38 @@
+import re
+from typing import List, Optional, Text
+
+_ORDINAL_WORDS = {
+    "pertama": 1, "kesatu": 1, "kedua": 2, "ketiga": 3, "keempat": 4,
+    "kelima": 5, "keenam": 6, "ketujuh": 7, "kedelapan": 8,
+    "kesembilan": 9, "kesepuluh": 10, "terakhir": -1,
+    "first": 1, "second": 2, "third": 3, "fourth": 4, "fifth": 5, "last": -1,
+}
+
+# "pertama", "ketiga", "terakhir", "ke-2", "ke 4", "nomor 3", "no. 5", "#2".
+_ORDINAL_PATTERN = re.compile(
+    r"\b(" + "|".join(_ORDINAL_WORDS) + r")\b"
+    r"|\bke[- ]?(\d{1,2})\b"
+    r"|(?:\bnomor|\bno\.?|#)\s*(\d{1,2})\b",
+    re.IGNORECASE,
+)
+
+
+def parse_ordinals(text: Optional[Text]) -> List[int]:
+    """Posisi (1-based, -1 untuk "terakhir") yang disebut di `text`, urut kemunculan tanpa duplikat."""
+    positions: List[int] = []
+    for match in _ORDINAL_PATTERN.finditer(text or ""):
+        word, ke_number, number = match.groups()
+        position = _ORDINAL_WORDS[word.lower()] if word else int(ke_number or number)
+        if position != 0 and position not in positions:
+            positions.append(position)
+    return positions
+
+
+def pick_by_ordinals(items: List[Optional[Text]], positions: List[int]) -> List[Optional[Text]]:
+    """Ambil elemen `items` sesuai posisi ordinal; posisi di luar jangkauan diabaikan."""
+    picked: List[Optional[Text]] = []
+    for position in positions:
+        index = len(items) - 1 if position == -1 else position - 1
+        if 0 <= index < len(items) and items[index] not in picked:
+            picked.append(items[index])
+    return picked
@@ -0,0 +1,57 @@
+from typing import Any, Dict, Hashable, Text, Tuple
+from .action_models import Product
+
+MAX_RENDERED_CARDS = 5000
+
+_rendered_cards: Dict[Hashable, Tuple[Tuple[Any, ...], Text]] = {}
+
+
+def _fingerprint(product: Product) -> Tuple[Any, ...]:
+    return (
+        product.name,
+        product.price,
+        product.category,
+        product.stock,
+        product.image_url,
+        product.average_rating,
+        product.rating_count,
+    )
+
+
+def _render(product: Product, show_stock: bool, noun: Text) -> Text:
+    avg_rating = product.average_rating
+    rating_count = product.rating_count
+    lines = [f"\n- **{product.name}**"]
+    if rating_count > 0:
+        lines[0] += f" (⭐ {avg_rating:.1f}/5 dari {rating_count} ulasan)"
+    lines.append(f"  Harga: Rp {product.price}")
+    lines.append(f"  Kategori: {product.category}")
+    if show_stock:
+        lines.append(f"  Stok: {product.stock}")
+    if product.image_url:
+        lines.append(f"  Foto: {product.image_url}")
+    if avg_rating >= 4.5 and rating_count >= 3:
+        lines.append(f"  ✨ *{noun.capitalize()} ini sangat direkomendasikan!*")
+    elif avg_rating >= 4.0 and rating_count >= 1:
+        lines.append(f"  👍 *Rating {noun} ini bagus!*")
+    return "\n".join(lines) + "\n"
+
+
+def render_product_card(product: Product, show_stock: bool = False, noun: Text = "menu") -> Text:
+    """Blok markdown satu produk untuk balasan pencarian, daftar dan rekomendasi.
+
+    Hasil render di-memo per ID produk dan varian; render ulang hanya terjadi
+    jika salah satu field yang ditampilkan berubah.
+    """
+    key = (product.id, show_stock, noun)
+    fingerprint = _fingerprint(product)
+    cached = _rendered_cards.get(key)
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+
+    card = _render(product, show_stock, noun)
+    if product.id is not None:
+        if len(_rendered_cards) >= MAX_RENDERED_CARDS:
+            _rendered_cards.clear()
+        _rendered_cards[key] = (fingerprint, card)
+    return card
@@ -0,0 +1,182 @@
+import asyncio
+import contextlib
+import random
+import time
+from typing import AsyncIterator, Dict, Optional, Text
+from .action_constants import (
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RESET_TIMEOUT,
+    HTTP_BULKHEAD_CONCURRENCY,
+    HTTP_BULKHEAD_QUEUE,
+    HTTP_ENDPOINT_BULKHEADS,
+    HTTP_RETRY_BACKOFF_BASE,
+    HTTP_RETRY_BACKOFF_MAX,
+)
+from .action_metrics import (
+    BULKHEAD_IN_FLIGHT,
+    BULKHEAD_QUEUED,
+    BULKHEAD_QUEUE_DELAY,
+    BULKHEAD_REJECTIONS,
+)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class UpstreamUnavailableError(Exception):
+    """Upstream dianggap tidak tersedia: circuit terbuka atau semua percobaan habis karena timeout."""
+
+
+class BulkheadFullError(UpstreamUnavailableError):
+    """Semua slot bulkhead route terpakai dan antreannya penuh; request ditolak tanpa menunggu."""
+
+
+class CircuitBreaker:
+    """Circuit breaker per route upstream.
+
+    Terbuka setelah `failure_threshold` kegagalan berturut-turut sehingga
+    request langsung ditolak. Setelah `reset_timeout` detik satu request
+    percobaan (half-open) diizinkan; sukses menutup circuit kembali, gagal
+    membukanya lagi. Probe yang tidak melaporkan hasil dalam `reset_timeout`
+    detik dianggap hilang dan digantikan probe baru.
+    """
+
+    def __init__(
+        self,
+        name: Text,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: float = CIRCUIT_RESET_TIMEOUT,
+    ) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._probe_started_at = 0.0
+
+    def allow_request(self) -> bool:
+        if self.state == CLOSED:
+            return True
+        now = time.monotonic()
+        if self.state == OPEN and now - self._opened_at >= self.reset_timeout:
+            self.state = HALF_OPEN
+            self._probe_in_flight = False
+        if self._probe_in_flight and now - self._probe_started_at >= self.reset_timeout:
+            self._probe_in_flight = False
+        if self.state == HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            self._probe_started_at = now
+            return True
+        return False
+
+    def release_probe(self) -> None:
+        """Lepaskan klaim probe tanpa mencatat hasil, mis. karena request dibatalkan."""
+        self._probe_in_flight = False
+
+    def record_success(self) -> None:
+        if self.state != CLOSED:
+            print(f"Circuit '{self.name}' ditutup kembali.")
+        self.state = CLOSED
+        self._failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        self._probe_in_flight = False
+        if self.state == HALF_OPEN or self._failures >= self.failure_threshold:
+            if self.state != OPEN:
+                print(
+                    f"Circuit '{self.name}' dibuka setelah {self._failures} kegagalan berturut-turut.")
+            self.state = OPEN
+            self._opened_at = time.monotonic()
+
+
+_breakers: Dict[Text, CircuitBreaker] = {}
+
+
+def get_circuit_breaker(route: Text) -> CircuitBreaker:
+    breaker = _breakers.get(route)
+    if breaker is None:
+        breaker = _breakers[route] = CircuitBreaker(route)
+    return breaker
+
+
+class Bulkhead:
+    """Batas request bersamaan per route upstream.
+
+    Paling banyak `max_concurrent` request berjalan; sisanya menunggu di
+    antrean sampai `max_queue` request. Jika antrean juga penuh, request
+    langsung ditolak dengan `BulkheadFullError` sehingga route yang lambat
+    tidak menumpuk coroutine dan koneksi yang dibutuhkan route lain.
+    """
+
+    def __init__(
+        self,
+        name: Text,
+        max_concurrent: int = HTTP_BULKHEAD_CONCURRENCY,
+        max_queue: int = HTTP_BULKHEAD_QUEUE,
+    ) -> None:
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self.in_flight = 0
+        self.queued = 0
+
+    @contextlib.asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        if self._semaphore.locked() and self.queued >= self.max_queue:
+            BULKHEAD_REJECTIONS.inc(self.name)
+            raise BulkheadFullError(
+                f"Bulkhead {self.name} penuh ({self.in_flight} berjalan, "
+                f"{self.queued} antre), request ditolak.")
+
+        started = time.perf_counter()
+        self.queued += 1
+        BULKHEAD_QUEUED.set(self.queued, self.name)
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.queued -= 1
+            BULKHEAD_QUEUED.set(self.queued, self.name)
+        BULKHEAD_QUEUE_DELAY.observe(time.perf_counter() - started, self.name)
+
+        self.in_flight += 1
+        BULKHEAD_IN_FLIGHT.set(self.in_flight, self.name)
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            BULKHEAD_IN_FLIGHT.set(self.in_flight, self.name)
+            self._semaphore.release()
+
+
+_bulkheads: Dict[Text, Bulkhead] = {}
+_bulkheads_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_bulkhead(route: Text) -> Bulkhead:
+    """Bulkhead route untuk event loop yang sedang berjalan.
+
+    Semaphore terikat ke event loop pertama yang menunggunya, jadi seperti
+    session HTTP, semua bulkhead dibuat ulang bila event loop berganti.
+    """
+    global _bulkheads_loop
+    loop = asyncio.get_running_loop()
+    if _bulkheads_loop is not loop:
+        _bulkheads.clear()
+        _bulkheads_loop = loop
+    bulkhead = _bulkheads.get(route)
+    if bulkhead is None:
+        max_concurrent, max_queue = HTTP_ENDPOINT_BULKHEADS.get(
+            route, (HTTP_BULKHEAD_CONCURRENCY, HTTP_BULKHEAD_QUEUE))
+        bulkhead = _bulkheads[route] = Bulkhead(route, max_concurrent, max_queue)
+    return bulkhead
+
+
+def backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff untuk percobaan ke-`attempt` (mulai 1)."""
+    return random.uniform(0, min(HTTP_RETRY_BACKOFF_MAX, HTTP_RETRY_BACKOFF_BASE * 2 ** (attempt - 1)))
@@ -0,0 +1,130 @@
+import bisect
+import re
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Sequence, Set, Text, Tuple
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+# Kata pengisi yang sering menempel pada kueri pencarian ("mau cari menu ayam bakar dong").
+QUERY_FILLER_WORDS = frozenset({
+    "mau", "ingin", "pengen", "cari", "carikan", "mencari", "menu", "tolong",
+    "dong", "deh", "ya", "yang", "ada", "saya", "aku", "kak", "min",
+})
+
+
+def normalize_text(text: Text) -> Text:
+    return _NON_ALNUM.sub(" ", (text or "").lower()).strip()
+
+
+def canonical_query(text: Text) -> Text:
+    """Kueri pencarian kanonik: huruf kecil, tanpa tanda baca dan kata pengisi.
+
+    "Ayam Bakar Madu", "ayam bakar madu " dan "mau cari ayam bakar madu!"
+    menjadi "ayam bakar madu". Jika semua kata adalah kata pengisi, kueri
+    yang sudah dinormalisasi dipakai apa adanya.
+    """
+    words = normalize_text(text).split()
+    kept = [word for word in words if word not in QUERY_FILLER_WORDS]
+    return " ".join(kept or words)
+
+
+def _trigrams(normalized: Text) -> Set[Text]:
+    padded = f" {normalized} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """Inverted index trigram karakter untuk pencarian nama yang toleran typo.
+
+    Skor sebuah dokumen adalah porsi trigram query yang ditemukan di namanya.
+    Jika ada dokumen yang memuat semua trigram query (praktis cocok substring),
+    hanya dokumen tersebut yang dikembalikan; selain itu dokumen dengan skor
+    minimal `min_score` dikembalikan sebagai hasil fuzzy.
+    """
+
+    def __init__(self, documents: Sequence[Tuple[Text, Any]], min_score: float = 0.6) -> None:
+        self.min_score = min_score
+        self._payloads: List[Any] = []
+        self._sizes: List[int] = []
+        self._postings: Dict[Text, List[int]] = defaultdict(list)
+        for name, payload in documents:
+            doc_id = len(self._payloads)
+            grams = _trigrams(normalize_text(name))
+            self._payloads.append(payload)
+            self._sizes.append(len(grams))
+            for gram in grams:
+                self._postings[gram].append(doc_id)
+
+    def __len__(self) -> int:
+        return len(self._payloads)
+
+    def search(self, query: Text) -> List[Any]:
+        normalized = normalize_text(query)
+        if not normalized:
+            return []
+        query_grams = _trigrams(normalized)
+        overlaps: Dict[int, int] = defaultdict(int)
+        for gram in query_grams:
+            for doc_id in self._postings.get(gram, ()):
+                overlaps[doc_id] += 1
+
+        query_size = len(query_grams)
+        scored = []
+        for doc_id, overlap in overlaps.items():
+            score = overlap / query_size
+            if score >= self.min_score:
+                dice = 2 * overlap / (query_size + self._sizes[doc_id])
+                scored.append((score, dice, doc_id))
+        if not scored:
+            return []
+
+        scored.sort(key=lambda item: (item[0], item[1]), reverse=True)
+        if scored[0][0] == 1.0:
+            scored = [item for item in scored if item[0] == 1.0]
+        return [self._payloads[doc_id] for _, _, doc_id in scored]
+
+
+class TokenPrefixIndex:
+    """Index prefix token untuk pencarian seperti "cabang serp" atau nama jalan.
+
+    Setiap dokumen boleh punya beberapa teks (mis. nama dan alamat). Sebuah
+    dokumen cocok jika setiap token query adalah prefix dari salah satu token
+    dokumen tersebut. Hasil dikembalikan dalam urutan dokumen saat index dibuat.
+    """
+
+    def __init__(self, documents: Sequence[Tuple[Sequence[Text], Any]]) -> None:
+        self._payloads: List[Any] = []
+        postings: Dict[Text, Set[int]] = defaultdict(set)
+        for texts, payload in documents:
+            doc_id = len(self._payloads)
+            self._payloads.append(payload)
+            for text in texts:
+                for token in normalize_text(text).split():
+                    postings[token].add(doc_id)
+        self._vocabulary = sorted(postings)
+        self._postings = postings
+
+    def __len__(self) -> int:
+        return len(self._payloads)
+
+    def _docs_with_prefix(self, prefix: Text) -> Set[int]:
+        docs: Set[int] = set()
+        start = bisect.bisect_left(self._vocabulary, prefix)
+        for token in self._vocabulary[start:]:
+            if not token.startswith(prefix):
+                break
+            docs |= self._postings[token]
+        return docs
+
+    def search(self, query: Text) -> List[Any]:
+        tokens = normalize_text(query).split()
+        if not tokens:
+            return []
+        matches: Optional[Set[int]] = None
+        for token in tokens:
+            docs = self._docs_with_prefix(token)
+            matches = docs if matches is None else matches & docs
+            if not matches:
+                return []
+        return [self._payloads[doc_id] for doc_id in sorted(matches)]
@@ -1,5 +1,4 @@
 import aiohttp
-import urllib.parse
 from typing import Any, Text, Dict, List
 
 from rasa_sdk import Action, Tracker
@@ -7,7 +6,9 @@ from rasa_sdk.executor import CollectingDispatcher
 from rasa_sdk.events import SlotSet
 from rasa_sdk.types import DomainDict
 
-from .action_constants import API_ROOT_URL  
+from .action_catalog import search_products, search_products_upstream
+from .action_resilience import UpstreamUnavailableError
+from .action_product_render import render_product_card
 
 
 class ActionSearchProductAPI(Action): 
@@ -27,68 +28,52 @@ class ActionSearchProductAPI(Action):
             dispatcher.utter_message(text="Produk apa yang ingin Anda cari?")
             return [SlotSet("product_name_slot", None)]
 
-        encoded_search_term = urllib.parse.quote_plus(product_search_term)
-        request_url = f"{API_ROOT_URL}/product?searchByName={encoded_search_term}"
-
-        print(f"Requesting product data from URL: {request_url}")
-
         found_products_details = []
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(request_url) as response:
-                    if response.status == 200:
-                        response_data = await response.json()
-                        if response_data.get("success") and "data" in response_data and "products" in response_data["data"]:
-                            api_products = response_data["data"]["products"]
-                            if not api_products:
-                                dispatcher.utter_message(
-                                    text=f"Maaf, saya tidak menemukan produk dengan nama yang mirip '{product_search_term}'.")
-                                return [SlotSet("product_name_slot", None)]
-
-                            for product in api_products:
-                                found_products_details.append({
-                                    "id": product.get("_id"),
-                                    "name": product.get("name", "Nama tidak tersedia"),
-                                    "price": product.get("price", "Harga tidak tersedia"),
-                                    "description": product.get("description", ""),
-                                    "stock": product.get("stock", "Tidak diketahui"),
-                                    "category": product.get("category", "Tidak diketahui"),
-                                    "image_url": product.get("productImageURL"),
-                                    "average_rating": product.get("averageRating", 0.0),
-                                    "rating_count": product.get("ratingCount", 0)
-                                })
-
-                            if found_products_details:
-                                found_products_details.sort(
-                                    key=lambda x: (
-                                        x.get('average_rating', 0.0), x.get('rating_count', 0)),
-                                    reverse=True
-                                )
-                        elif not response_data.get("success"):
-                            api_message = response_data.get(
-                                "message", "Gagal memproses permintaan produk di server.")
-                            print(
-                                f"API product reported an error for search term '{product_search_term}': {api_message}")
-                            dispatcher.utter_message(
-                                text=f"Info dari server: {api_message}") 
-                            return [SlotSet("product_name_slot", None)]
-                        else:
-                            print(
-                                f"API product response format issue for search term '{product_search_term}': {response_data}")
-                            dispatcher.utter_message(
-                                text="Format respons API produk tidak sesuai.")
-                            return [SlotSet("product_name_slot", None)]
+            api_products = search_products(product_search_term)
+            if api_products:
+                print(
+                    f"Product search for '{product_search_term}' answered from local index ({len(api_products)} hits).")
+            else:
+                print(
+                    f"Product search for '{product_search_term}' not in local index, querying upstream.")
+                result = await search_products_upstream(product_search_term)
+                if result.status == 200:
+                    response_data = result.data
+                    if response_data.get("success") and "data" in response_data and "products" in response_data["data"]:
+                        api_products = response_data["data"]["products"]
+                    elif not response_data.get("success"):
+                        api_message = response_data.get(
+                            "message", "Gagal memproses permintaan produk di server.")
+                        print(
+                            f"API product reported an error for search term '{product_search_term}': {api_message}")
+                        dispatcher.utter_message(
+                            text=f"Info dari server: {api_message}") 
+                        return [SlotSet("product_name_slot", None)]
                     else:
                         print(
-                            f"API product request failed for search term '{product_search_term}' with status: {response.status}")
-                        error_text = await response.text()
-                        print(f"API product error response: {error_text}")
+                            f"API product response format issue for search term '{product_search_term}': {response_data}")
                         dispatcher.utter_message(
-                            text=f"Maaf, gagal mengambil data produk dari server (status: {response.status})."
-                        )
+                            text="Format respons API produk tidak sesuai.")
                         return [SlotSet("product_name_slot", None)]
-        except aiohttp.ClientConnectorError as e:
+                else:
+                    print(
+                        f"API product request failed for search term '{product_search_term}' with status: {result.status}")
+                    print(f"API product error response: {result.text}")
+                    dispatcher.utter_message(
+                        text=f"Maaf, gagal mengambil data produk dari server (status: {result.status})."
+                    )
+                    return [SlotSet("product_name_slot", None)]
+
+            if not api_products:
+                dispatcher.utter_message(
+                    text=f"Maaf, saya tidak menemukan produk dengan nama yang mirip '{product_search_term}'.")
+                return [SlotSet("product_name_slot", None)]
+
+            found_products_details = sorted(
+                api_products, key=lambda product: product.rating_key, reverse=True)
+        except (aiohttp.ClientConnectorError, UpstreamUnavailableError) as e:
             print(
                 f"Connection Error calling product API for search term '{product_search_term}': {e}")
             dispatcher.utter_message(
@@ -112,23 +97,8 @@ class ActionSearchProductAPI(Action):
             message_parts = [
                 f"Berikut produk yang kami temukan untuk '{product_search_term}':\n"] 
 
-            for product_detail in products_to_display:
-                part = f"\n- **{product_detail['name']}**"
-                avg_rating = product_detail.get('average_rating', 0.0)
-                rating_count = product_detail.get('rating_count', 0)
-                if rating_count > 0:
-                    part += f" (⭐ {avg_rating:.1f}/5 dari {rating_count} ulasan)"
-                part += "\n"
-                part += f"  Harga: Rp {product_detail['price']}\n"
-                part += f"  Kategori: {product_detail['category']}\n"
-                part += f"  Stok: {product_detail['stock']}\n"
-                if product_detail['image_url']:
-                    part += f"  Foto: {product_detail['image_url']}\n"
-                if avg_rating >= 4.5 and rating_count >= 3:
-                    part += "  ✨ *Menu ini sangat direkomendasikan!*\n"
-                elif avg_rating >= 4.0 and rating_count >= 1:
-                    part += "  👍 *Rating menu ini bagus!*\n"
-                message_parts.append(part)
+            message_parts.extend(
+                render_product_card(product_detail, show_stock=True) for product_detail in products_to_display)
 
             if len(found_products_details) > 5:
                 message_parts.append(
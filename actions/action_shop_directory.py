@@ -0,0 +1,65 @@
+from typing import List, Optional, Text
+from .action_catalog import SHOPS_KEY, catalog_cache
+from .action_http_client import ApiResponse
+from .action_metrics import CACHE_REQUESTS
+from .action_models import Shop
+from .action_search_index import TokenPrefixIndex, normalize_text
+
+
+def render_shop_card(shop: Shop, show_description: bool = False) -> Text:
+    part = f"\n- **{shop.name}**\n"
+    if shop.address and shop.address.lower() != "alamat tidak tersedia":
+        part += f"  Alamat: {shop.address}\n"
+    if shop.owner_name and shop.owner_name.lower() != "nama pemilik tidak diketahui":
+        part += f"  Pemilik: {shop.owner_name}\n"
+    if show_description and shop.description and shop.description.lower() != "tidak ada deskripsi":
+        part += f"  Deskripsi: {shop.description}\n"
+    if shop.banner_image_url:
+        part += f"  Banner: {shop.banner_image_url}\n"
+    return part
+
+
+class ShopDirectory:
+    """Direktori toko yang sudah diurutkan berdasarkan nama beserta index pencariannya."""
+
+    def __init__(self, shops: List[Shop]) -> None:
+        self.shops = sorted(shops, key=lambda shop: shop.name.lower())
+        self._normalized_names = [normalize_text(shop.name) for shop in self.shops]
+        self._index = TokenPrefixIndex(
+            [((shop.name, shop.address), shop) for shop in self.shops])
+
+    def search(self, query: Text) -> List[Shop]:
+        """Cocokkan prefix token nama/alamat, lalu substring nama sebagai cadangan."""
+        hits = self._index.search(query)
+        if hits:
+            return hits
+        normalized = normalize_text(query)
+        if not normalized:
+            return []
+        return [shop for shop, name in zip(self.shops, self._normalized_names) if normalized in name]
+
+
+_directory: Optional[ShopDirectory] = None
+_directory_source: Optional[ApiResponse] = None
+
+
+def shop_directory_for(result: ApiResponse) -> ShopDirectory:
+    """ShopDirectory untuk respons `/shop` tertentu; dibangun ulang hanya jika respons berganti."""
+    global _directory, _directory_source
+    if result is not _directory_source or _directory is None:
+        _directory = ShopDirectory(
+            result.data.get("data", {}).get("shops") or [])
+        _directory_source = result
+    return _directory
+
+
+def search_shops(search_term: Text) -> List[Shop]:
+    """Cari toko di direktori lokal.
+
+    Mengembalikan list kosong jika direktori belum ada di cache atau tidak ada
+    toko yang cocok; pemanggil lalu jatuh ke pencarian upstream.
+    """
+    cached = catalog_cache.get(SHOPS_KEY)
+    hits = shop_directory_for(cached).search(search_term) if cached is not None else []
+    CACHE_REQUESTS.inc("shop_directory", "hit" if hits else "miss")
+    return hits
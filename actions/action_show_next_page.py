@@ -0,0 +1,88 @@
+import aiohttp
+from typing import Any, Text, Dict, List, Optional, Sequence
+from rasa_sdk import Action, Tracker
+from rasa_sdk.executor import CollectingDispatcher
+from rasa_sdk.events import SlotSet
+from rasa_sdk.types import DomainDict
+from .action_catalog import get_products, get_shops
+from .action_resilience import UpstreamUnavailableError
+from .action_shop_directory import shop_directory_for
+from .action_listing import (
+    LISTING_CURSOR_SLOT,
+    PRODUCTS_LISTING,
+    SHOPS_LISTING,
+    decode_cursor,
+    get_snapshot,
+    render_product_page,
+    render_shop_page,
+    snapshot_id_of,
+)
+
+
+async def _current_listing(kind: Text) -> Optional[Sequence[Any]]:
+    """Daftar terbaru dari cache katalog, dipakai jika snapshot sudah tidak ada di worker ini."""
+    if kind == PRODUCTS_LISTING:
+        result = await get_products()
+        if result.status == 200 and result.data.get("success"):
+            return result.data.get("data", {}).get("products")
+    elif kind == SHOPS_LISTING:
+        result = await get_shops()
+        if result.status == 200 and result.data.get("success"):
+            return shop_directory_for(result).shops
+    return None
+
+
+class ActionShowNextPage(Action):
+    def name(self) -> Text:
+        return "action_show_next_page"
+
+    async def run(self, dispatcher: CollectingDispatcher, tracker: Tracker, domain: DomainDict
+                  ) -> List[Dict[Text, Any]]:
+
+        cursor = decode_cursor(tracker.get_slot(LISTING_CURSOR_SLOT))
+        if cursor is None:
+            dispatcher.utter_message(
+                text="Tidak ada halaman berikutnya. Coba minta daftar produk atau toko terlebih dahulu.")
+            return [SlotSet(LISTING_CURSOR_SLOT, None)]
+
+        kind, snapshot_id, offset = cursor
+        print(f"Showing next {kind} page from snapshot {snapshot_id} at offset {offset}")
+
+        restarted = False
+        items = get_snapshot(kind, snapshot_id)
+        if items is None:
+            try:
+                items = await _current_listing(kind)
+            except (aiohttp.ClientConnectorError, UpstreamUnavailableError) as e:
+                print(f"Connection Error while reloading {kind} listing: {e}")
+                dispatcher.utter_message(
+                    text="Maaf, tidak dapat terhubung ke layanan kami. Periksa koneksi Anda.")
+                return []
+            except Exception as e:
+                print(f"An unexpected error occurred while reloading {kind} listing: {e}")
+                dispatcher.utter_message(
+                    text="Maaf, terjadi kesalahan yang tidak terduga saat memuat halaman berikutnya.")
+                return []
+            if items and snapshot_id_of(items) != snapshot_id:
+                # Katalog berubah sejak halaman sebelumnya; offset lama tidak
+                # lagi menunjuk ke posisi yang sama, jadi mulai dari awal.
+                print(f"{kind} snapshot {snapshot_id} is gone and the listing changed, restarting")
+                restarted = True
+                offset = 0
+
+        if not items or offset >= len(items):
+            dispatcher.utter_message(
+                text="Itu sudah semua, tidak ada lagi yang bisa ditampilkan.")
+            return [SlotSet(LISTING_CURSOR_SLOT, None)]
+
+        if kind == PRODUCTS_LISTING:
+            header = ("Daftar produk sudah berubah, berikut dari awal:\n" if restarted
+                      else "Berikut produk berikutnya:\n")
+            message, next_cursor = render_product_page(items, offset, header)
+        else:
+            header = ("Daftar toko sudah berubah, berikut dari awal:\n" if restarted
+                      else "Berikut toko berikutnya:\n")
+            message, next_cursor = render_shop_page(items, offset, header)
+
+        dispatcher.utter_message(text=message)
+        return [SlotSet(LISTING_CURSOR_SLOT, next_cursor)]
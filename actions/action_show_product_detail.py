@@ -1,11 +1,152 @@
+import asyncio
 import aiohttp
-import urllib.parse
-from typing import Any, Text, Dict, List
+from typing import Any, Text, Dict, List, Optional, Tuple
 from rasa_sdk import Action, Tracker
 from rasa_sdk.executor import CollectingDispatcher
 from rasa_sdk.events import SlotSet
 from rasa_sdk.types import DomainDict
-from .action_constants import API_ROOT_URL
+from .action_constants import (
+    PRODUCT_DETAIL_BATCH_CONCURRENCY,
+    PRODUCT_DETAIL_BATCH_MAX_ITEMS,
+)
+from .action_catalog import (
+    PRODUCTS_KEY,
+    get_product_detail,
+    resolve_product_id,
+    search_products,
+    search_products_upstream,
+    search_url,
+)
+from .action_ordinals import parse_ordinals, pick_by_ordinals
+from .action_resilience import UpstreamUnavailableError
+from .action_search_index import normalize_text
+
+
+async def find_product_id(product_name_to_detail: Text) -> Optional[Text]:
+    """ID produk untuk nama yang disebut pengguna: cache nama-ID, indeks lokal, lalu pencarian upstream."""
+    product_id_found = resolve_product_id(product_name_to_detail)
+    if product_id_found:
+        print(
+            f"ID produk untuk '{product_name_to_detail}' ditemukan dari cache nama-ID.")
+        return product_id_found
+
+    api_products = search_products(product_name_to_detail)
+    if api_products:
+        print(
+            f"ID produk untuk '{product_name_to_detail}' ditemukan dari indeks lokal.")
+    else:
+        print(
+            f"Mencari ID produk dengan URL: {search_url(PRODUCTS_KEY, product_name_to_detail)}")
+
+        search_result = await search_products_upstream(product_name_to_detail)
+        if search_result.status == 200:
+            search_data = search_result.data
+            if search_data.get("success") and "data" in search_data and "products" in search_data["data"]:
+                api_products = search_data["data"]["products"]
+                if not api_products:
+                    print(
+                        f"Array produk kosong saat mencari ID untuk '{product_name_to_detail}'.")
+            else:
+                print(
+                    f"Format API pencarian tidak sesuai atau success=false saat mencari ID. Data: {search_data}")
+        else:
+            print(
+                f"Pencarian ID produk gagal dengan status: {search_result.status}")
+
+    if api_products:
+        for prod in api_products:
+            if prod.name.lower() == product_name_to_detail.lower():
+                product_id_found = prod.id
+                break
+        if not product_id_found:
+            product_id_found = api_products[0].id
+
+        if not product_id_found:
+            print(
+                f"Tidak ditemukan ID untuk produk '{product_name_to_detail}' dari hasil pencarian.")
+    return product_id_found
+
+
+def format_product_detail(product_detail: Dict[Text, Any]) -> Text:
+    name = product_detail.get(
+        "name", "Nama tidak tersedia")
+    description = product_detail.get(
+        "description", "Tidak ada deskripsi.")
+    price = product_detail.get(
+        "price", "Harga tidak tersedia")
+    category = product_detail.get(
+        "category", "Kategori tidak diketahui")
+    stock = product_detail.get(
+        "stock", "Stok tidak diketahui")
+    image_url = product_detail.get("productImageURL")
+    avg_rating = product_detail.get(
+        "averageRating", 0.0)
+    rating_count = product_detail.get("ratingCount", 0)
+
+    message = f"Berikut detail untuk **{name}**:\n"
+    if description and description.lower() != "tidak ada deskripsi.":
+        message += f"- Deskripsi: {description}\n"
+    message += f"- Harga: Rp {price}\n"
+    message += f"- Kategori: {category}\n"
+    message += f"- Stok: {stock}\n"
+    if rating_count > 0:
+        message += f"- Rating: ⭐ {avg_rating:.1f}/5 ({rating_count} ulasan)\n"
+    else:
+        message += "- Rating: Belum ada ulasan\n"
+    if image_url:
+        message += f"- Foto: {image_url}\n"
+    return message
+
+
+_RECOMMENDATION_ACTIONS = {
+    "action_recommend_products",
+    "utter_ask_after_recommendations",
+    "utter_ask_which_recommendation_detail",
+}
+
+
+def _replies_to_recommendation(tracker: Tracker) -> bool:
+    """True jika aksi bot terakhir sebelum pesan pengguna terakhir adalah rekomendasi produk."""
+    seen_latest_user_message = False
+    for event in reversed(tracker.events):
+        if event.get("event") == "user":
+            if seen_latest_user_message:
+                return False
+            seen_latest_user_message = True
+        elif (seen_latest_user_message and event.get("event") == "action"
+              and event.get("name") != "action_listen"):
+            return event.get("name") in _RECOMMENDATION_ACTIONS
+    return False
+
+
+def _product_references(tracker: Tracker) -> List[Tuple[Text, Optional[Text]]]:
+    """Produk yang dirujuk pesan terakhir sebagai pasangan (label, ID bila sudah diketahui).
+
+    Ordinal ("yang pertama dan ketiga") dipetakan lewat slot
+    `recommended_product_ids`, tetapi hanya pada balasan langsung atas
+    rekomendasi atau bila pesan tidak menyebut nama produk; slot itu bertahan
+    sepanjang percakapan sehingga "ke-2" di pesan lain belum tentu merujuk ke
+    rekomendasi. Nama dari entity `product_name` di-resolve nanti.
+    """
+    references: List[Tuple[Text, Optional[Text]]] = []
+    entity_values = list(tracker.get_latest_entity_values("product_name"))
+    if _replies_to_recommendation(tracker) or not entity_values:
+        recommended_ids = tracker.get_slot("recommended_product_ids") or []
+        positions = parse_ordinals(tracker.latest_message.get("text"))
+        for product_id in pick_by_ordinals(list(recommended_ids), positions):
+            if product_id is None:
+                # Produk yang ditampilkan tanpa ID tidak bisa diambil detailnya.
+                continue
+            position = recommended_ids.index(product_id) + 1
+            references.append((f"rekomendasi ke-{position}", product_id))
+
+    seen_names = set()
+    for entity_value in entity_values:
+        normalized = normalize_text(entity_value)
+        if normalized and normalized not in seen_names:
+            seen_names.add(normalized)
+            references.append((entity_value, None))
+    return references
 
 
 class ActionShowProductDetail(Action):
@@ -16,11 +157,14 @@ class ActionShowProductDetail(Action):
         self, dispatcher: CollectingDispatcher, tracker: Tracker, domain: DomainDict
     ) -> List[Dict[Text, Any]]:
 
+        references = _product_references(tracker)
+        if len(references) > 1:
+            return await self._run_batch(dispatcher, references)
+
         product_name_to_detail = tracker.get_slot("product_name_slot")
-        latest_product_entity = next(
-            tracker.get_latest_entity_values("product_name"), None)
-        if latest_product_entity:
-            product_name_to_detail = latest_product_entity
+        known_product_id = None
+        if references:
+            product_name_to_detail, known_product_id = references[0]
 
         print(
             f"Action 'action_show_product_detail' dipanggil untuk produk: {product_name_to_detail}")
@@ -30,98 +174,37 @@ class ActionShowProductDetail(Action):
                 text="Produk mana yang ingin Anda lihat detailnya? Mohon sebutkan namanya.")
             return []
 
-        product_id_found = None
         try:
-            encoded_search_term = urllib.parse.quote_plus(
-                product_name_to_detail)
-            search_url = f"{API_ROOT_URL}/product?searchByName={encoded_search_term}"
-            print(f"Mencari ID produk dengan URL: {search_url}")
-
-            async with aiohttp.ClientSession() as session:
-                async with session.get(search_url) as search_response:
-                    if search_response.status == 200:
-                        search_data = await search_response.json()
-                        if search_data.get("success") and "data" in search_data and "products" in search_data["data"]:
-                            api_products = search_data["data"]["products"]
-                            if api_products:
-                                for prod in api_products:
-                                    if prod.get("name", "").lower() == product_name_to_detail.lower():
-                                        product_id_found = prod.get("_id")
-                                        break
-                                if not product_id_found:
-                                    product_id_found = api_products[0].get(
-                                        "_id")
-
-                                if not product_id_found:
-                                    print(
-                                        f"Tidak ditemukan ID untuk produk '{product_name_to_detail}' dari hasil pencarian.")
-                            else:
-                                print(
-                                    f"Array produk kosong saat mencari ID untuk '{product_name_to_detail}'.")
-                        else:
-                            print(
-                                f"Format API pencarian tidak sesuai atau success=false saat mencari ID. Data: {search_data}")
-                    else:
-                        print(
-                            f"Pencarian ID produk gagal dengan status: {search_response.status}")
+            product_id_found = known_product_id or await find_product_id(product_name_to_detail)
 
             if not product_id_found:
                 dispatcher.utter_message(
                     text=f"Maaf, saya tidak bisa menemukan detail untuk produk '{product_name_to_detail}'. Mungkin nama produknya kurang spesifik atau tidak ada?")
                 return [SlotSet("product_name_slot", None)]
 
-            detail_url = f"{API_ROOT_URL}/product/{product_id_found}"
-            print(f"Mengambil detail produk dari URL: {detail_url}")
-
-            async with aiohttp.ClientSession() as session:
-                async with session.get(detail_url) as detail_response:
-                    if detail_response.status == 200:
-                        detail_data = await detail_response.json()
-                        if detail_data.get("success") and "data" in detail_data:
-                            product_detail = detail_data["data"]
-                            name = product_detail.get(
-                                "name", "Nama tidak tersedia")
-                            description = product_detail.get(
-                                "description", "Tidak ada deskripsi.")
-                            price = product_detail.get(
-                                "price", "Harga tidak tersedia")
-                            category = product_detail.get(
-                                "category", "Kategori tidak diketahui")
-                            stock = product_detail.get(
-                                "stock", "Stok tidak diketahui")
-                            image_url = product_detail.get("productImageURL")
-                            avg_rating = product_detail.get(
-                                "averageRating", 0.0)
-                            rating_count = product_detail.get("ratingCount", 0)
-
-                            message = f"Berikut detail untuk **{name}**:\n"
-                            if description and description.lower() != "tidak ada deskripsi.":
-                                message += f"- Deskripsi: {description}\n"
-                            message += f"- Harga: Rp {price}\n"
-                            message += f"- Kategori: {category}\n"
-                            message += f"- Stok: {stock}\n"
-                            if rating_count > 0:
-                                message += f"- Rating: ⭐ {avg_rating:.1f}/5 ({rating_count} ulasan)\n"
-                            else:
-                                message += f"- Rating: Belum ada ulasan\n"
-                            if image_url:
-                                message += f"- Foto: {image_url}\n"
-                            dispatcher.utter_message(text=message)
-                        elif not detail_data.get("success"):
-                            api_message = detail_data.get(
-                                "message", "Gagal mengambil detail produk.")
-                            dispatcher.utter_message(
-                                text=f"Info dari server: {api_message}")
-                        else:
-                            dispatcher.utter_message(
-                                text="Format respons API detail produk tidak sesuai.")
-                    else:
-                        error_text = await detail_response.text()
-                        print(
-                            f"API detail product request failed with status: {detail_response.status}, response: {error_text}")
-                        dispatcher.utter_message(
-                            text=f"Maaf, gagal mengambil detail produk dari server (status: {detail_response.status}).")
-        except aiohttp.ClientConnectorError as e:
+            print(f"Mengambil detail produk dengan ID: {product_id_found}")
+
+            detail_result = await get_product_detail(product_id_found)
+            if detail_result.status == 200:
+                detail_data = detail_result.data
+                if detail_data.get("success") and "data" in detail_data:
+                    dispatcher.utter_message(
+                        text=format_product_detail(detail_data["data"]))
+                elif not detail_data.get("success"):
+                    api_message = detail_data.get(
+                        "message", "Gagal mengambil detail produk.")
+                    dispatcher.utter_message(
+                        text=f"Info dari server: {api_message}")
+                else:
+                    dispatcher.utter_message(
+                        text="Format respons API detail produk tidak sesuai.")
+            else:
+                error_text = detail_result.text
+                print(
+                    f"API detail product request failed with status: {detail_result.status}, response: {error_text}")
+                dispatcher.utter_message(
+                    text=f"Maaf, gagal mengambil detail produk dari server (status: {detail_result.status}).")
+        except (aiohttp.ClientConnectorError, UpstreamUnavailableError) as e:
             print(f"Connection Error in ActionShowProductDetail: {e}")
             dispatcher.utter_message(
                 text="Maaf, tidak dapat terhubung ke layanan produk.")
@@ -136,3 +219,57 @@ class ActionShowProductDetail(Action):
             dispatcher.utter_message(
                 text="Maaf, terjadi kesalahan yang tidak terduga saat memproses permintaan Anda.")
         return [SlotSet("product_name_slot", None)]
+
+    async def _run_batch(
+        self, dispatcher: CollectingDispatcher, references: List[Tuple[Text, Optional[Text]]]
+    ) -> List[Dict[Text, Any]]:
+        """Tampilkan detail beberapa produk sekaligus dalam satu balasan.
+
+        Resolusi nama dan pengambilan detail tiap produk berjalan bersamaan,
+        dibatasi semaphore agar satu pesan tidak membanjiri backend.
+        """
+        print(
+            f"Action 'action_show_product_detail' dipanggil untuk {len(references)} produk: {[label for label, _ in references]}")
+
+        skipped = references[PRODUCT_DETAIL_BATCH_MAX_ITEMS:]
+        references = references[:PRODUCT_DETAIL_BATCH_MAX_ITEMS]
+        semaphore = asyncio.Semaphore(PRODUCT_DETAIL_BATCH_CONCURRENCY)
+
+        async def _detail_for(label: Text, product_id: Optional[Text]) -> Text:
+            async with semaphore:
+                product_id = product_id or await find_product_id(label)
+                if not product_id:
+                    return f"Maaf, saya tidak bisa menemukan detail untuk produk '{label}'.\n"
+                detail_result = await get_product_detail(product_id)
+            if detail_result.status == 200:
+                detail_data = detail_result.data
+                if detail_data.get("success") and "data" in detail_data:
+                    return format_product_detail(detail_data["data"])
+                api_message = detail_data.get(
+                    "message", "Gagal mengambil detail produk.")
+                return f"Info dari server untuk '{label}': {api_message}\n"
+            print(
+                f"API detail product request failed with status: {detail_result.status}, response: {detail_result.text}")
+            return f"Maaf, gagal mengambil detail '{label}' dari server (status: {detail_result.status}).\n"
+
+        results = await asyncio.gather(
+            *(_detail_for(label, product_id) for label, product_id in references),
+            return_exceptions=True)
+
+        message_parts = []
+        for (label, _), result in zip(references, results):
+            if isinstance(result, (aiohttp.ClientConnectorError, UpstreamUnavailableError)):
+                print(f"Connection Error in ActionShowProductDetail for '{label}': {result}")
+                result = f"Maaf, tidak dapat terhubung ke layanan produk untuk '{label}'.\n"
+            elif isinstance(result, Exception):
+                print(
+                    f"An unexpected error occurred in ActionShowProductDetail for '{label}': {result}")
+                result = f"Maaf, terjadi kesalahan saat mengambil detail '{label}'.\n"
+            message_parts.append(result)
+
+        if skipped:
+            message_parts.append(
+                f"(Saya tampilkan {len(references)} produk dulu; sebutkan lagi sisanya: {', '.join(label for label, _ in skipped)}.)\n")
+
+        dispatcher.utter_message(text="\n".join(message_parts))
+        return [SlotSet("product_name_slot", None)]
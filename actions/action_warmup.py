@@ -0,0 +1,105 @@
+import asyncio
+import time
+from typing import Optional, Text
+from .action_catalog import (
+    CATALOG_LOADERS,
+    SHOPS_KEY,
+    catalog_cache,
+    refresh_catalog_entry,
+    warm_product_index,
+)
+from .action_constants import (
+    CATALOG_REFRESH_INTERVAL,
+    CATALOG_WARMUP_READY_TIMEOUT,
+    CATALOG_WARMUP_RETRY_INTERVAL,
+)
+from .action_metrics import ACTION_SERVER_READY, CATALOG_REFRESHES
+from .action_shop_directory import shop_directory_for
+
+_ready = False
+_refresh_task: Optional[asyncio.Task] = None
+
+
+def is_ready() -> bool:
+    return _ready
+
+
+def _mark_ready(reason: Text) -> None:
+    global _ready
+    if not _ready:
+        print(f"Action server siap menerima trafik ({reason}).")
+        _ready = True
+        ACTION_SERVER_READY.set(1)
+
+
+async def refresh_catalog() -> bool:
+    """Muat ulang produk, rekomendasi, dan toko secara paralel lalu bangun indeks lokalnya.
+
+    Mengembalikan True hanya jika ketiganya berhasil diperbarui. Entri yang
+    gagal tetap memakai data lama di cache.
+    """
+    keys = list(CATALOG_LOADERS)
+    results = await asyncio.gather(
+        *(refresh_catalog_entry(key) for key in keys), return_exceptions=True)
+
+    all_ok = True
+    for key, outcome in zip(keys, results):
+        if isinstance(outcome, Exception):
+            print(f"Refresh katalog '{key}' gagal: {outcome}")
+            CATALOG_REFRESHES.inc(key, "error")
+            all_ok = False
+        elif not outcome:
+            print(f"Refresh katalog '{key}' tidak mendapat respons yang valid, data lama tetap dipakai.")
+            CATALOG_REFRESHES.inc(key, "failed")
+            all_ok = False
+        else:
+            CATALOG_REFRESHES.inc(key, "ok")
+
+    warm_product_index()
+    shops = catalog_cache.get(SHOPS_KEY)
+    if shops is not None:
+        shop_directory_for(shops)
+    return all_ok
+
+
+async def _refresh_loop() -> None:
+    started = time.monotonic()
+    while True:
+        try:
+            warmed = await refresh_catalog()
+        except Exception as e:
+            print(f"Refresh katalog terhenti karena kesalahan tak terduga: {e}")
+            warmed = False
+
+        if warmed:
+            _mark_ready("warm-up katalog selesai")
+        elif not _ready and time.monotonic() - started >= CATALOG_WARMUP_READY_TIMEOUT:
+            # Upstream belum pulih; lebih baik melayani dengan fallback ke
+            # upstream per permintaan daripada tidak pernah siap.
+            _mark_ready("warm-up belum lengkap, batas waktu tercapai")
+
+        if _ready and CATALOG_REFRESH_INTERVAL <= 0:
+            return
+        await asyncio.sleep(
+            CATALOG_REFRESH_INTERVAL if _ready else CATALOG_WARMUP_RETRY_INTERVAL)
+
+
+def start_catalog_refresh() -> None:
+    """Mulai warm-up katalog dan refresh periodik di event loop yang sedang berjalan."""
+    global _refresh_task
+    if _refresh_task is not None and not _refresh_task.done():
+        return
+    ACTION_SERVER_READY.set(0)
+    _refresh_task = asyncio.get_running_loop().create_task(_refresh_loop())
+
+
+async def stop_catalog_refresh() -> None:
+    global _refresh_task
+    if _refresh_task is None:
+        return
+    _refresh_task.cancel()
+    try:
+        await _refresh_task
+    except asyncio.CancelledError:
+        pass
+    _refresh_task = None
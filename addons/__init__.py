@@ -0,0 +1,5 @@
+"""Komponen Rasa kustom untuk assistant Ayam Bakar Nusantara.
+
+Dirujuk dari `config.yml` lewat path modul lengkap, misalnya
+`addons.cached_llm_components.CachingCompactLLMCommandGenerator`.
+"""
@@ -0,0 +1,263 @@
+"""Varian ber-cache dari CompactLLMCommandGenerator dan IntentlessPolicy.
+
+Pesan pendek yang sering berulang ("halo", "menu apa aja?", "cek pesanan
+saya") pada state dialog yang sama menghasilkan command / respons yang sama,
+jadi panggilan Gemini untuk pesan tersebut cukup dilakukan sekali per TTL.
+
+Key cache = pesan pengguna yang dinormalisasi + flow aktif + slot terisi +
+ucapan bot terakhir. Pesan yang lebih panjang dari `max_message_chars` tidak
+di-cache karena kemungkinan berulangnya kecil.
+
+Embedding untuk flow retrieval juga di-cache: vektor deskripsi flow disimpan
+di file `flow_embeddings.path` (lihat `flow_embeddings.py`) dan embedding
+pesan pengguna disimpan di cache LRU berukuran `query_cache_size`.
+Jumlah token tiap prompt yang dirender dicatat lewat `prompt_tokens.py`.
+
+Contoh di config.yml:
+
+    - name: addons.cached_llm_components.CachingCompactLLMCommandGenerator
+      response_cache:
+        max_size: 2000
+        ttl: 900
+      flow_embeddings:
+        path: .rasa/flow_embeddings.vec
+"""
+from typing import Any, Dict, List, Optional, Text, Tuple
+
+import structlog
+from rasa.core.policies.intentless_policy import IntentlessPolicy
+from rasa.dialogue_understanding.commands import Command
+from rasa.dialogue_understanding.generator import CompactLLMCommandGenerator
+from rasa.dialogue_understanding.stack.utils import top_user_flow_frame
+from rasa.engine.graph import ExecutionContext
+from rasa.engine.recipes.default_recipe import DefaultV1Recipe
+from rasa.engine.storage.resource import Resource
+from rasa.engine.storage.storage import ModelStorage
+from rasa.shared.core.constants import DEFAULT_SLOT_NAMES
+from rasa.shared.core.flows import FlowsList
+from rasa.shared.core.trackers import DialogueStateTracker
+from rasa.shared.nlu.constants import TEXT
+from rasa.shared.nlu.training_data.message import Message
+
+from .flow_embeddings import CachedEmbeddings, FlowEmbeddingStore, embedder_identity
+from .prompt_tokens import PromptTokenReport
+from .response_cache import (
+    BoundedTTLCache,
+    cacheable_commands,
+    normalize_message,
+    response_cache_key,
+)
+
+structlogger = structlog.get_logger()
+
+RESPONSE_CACHE_CONFIG_KEY = "response_cache"
+DEFAULT_RESPONSE_CACHE_CONFIG = {
+    "max_size": 1000,
+    "ttl": 600,
+    "max_message_chars": 80,
+    # Slot yang tidak memengaruhi keputusan LLM, mis. cursor paginasi.
+    "ignored_slots": [],
+}
+
+FLOW_EMBEDDINGS_CONFIG_KEY = "flow_embeddings"
+DEFAULT_FLOW_EMBEDDINGS_CONFIG = {
+    "path": ".rasa/flow_embeddings.vec",
+    "query_cache_size": 2048,
+}
+
+
+def _cache_config(config: Dict[Text, Any]) -> Dict[Text, Any]:
+    return {**DEFAULT_RESPONSE_CACHE_CONFIG, **(config.get(RESPONSE_CACHE_CONFIG_KEY) or {})}
+
+
+def _build_cache(cache_config: Dict[Text, Any]) -> BoundedTTLCache:
+    return BoundedTTLCache(
+        max_size=int(cache_config["max_size"]), ttl=float(cache_config["ttl"]))
+
+
+def attach_cached_embeddings(flow_retrieval: Any, config: Dict[Text, Any]) -> Optional[CachedEmbeddings]:
+    """Bungkus embedder flow retrieval dengan `CachedEmbeddings`.
+
+    Yang dibungkus: `_create_embedder` milik instance (dipakai saat train),
+    `embeddings`, dan embedding function vector store. `FlowRetrieval.load`
+    membuat embedder lewat classmethod dan menghasilkan objek baru, jadi
+    fungsi ini harus dipanggil lagi pada `flow_retrieval` hasil load.
+    """
+    if flow_retrieval is None:
+        return None
+    embeddings_config = {**DEFAULT_FLOW_EMBEDDINGS_CONFIG, **(config.get(FLOW_EMBEDDINGS_CONFIG_KEY) or {})}
+    cached: Optional[CachedEmbeddings] = None
+
+    def wrap(embedder: Any) -> Any:
+        nonlocal cached
+        if embedder is None or isinstance(embedder, CachedEmbeddings):
+            return embedder
+        if cached is None or cached.inner is not embedder:
+            # File vektor terikat ke model embedding; model lain membuangnya.
+            store = FlowEmbeddingStore(embeddings_config["path"], embedder_identity(embedder))
+            cached = CachedEmbeddings(
+                embedder, store, int(embeddings_config["query_cache_size"]))
+            structlogger.debug(
+                "caching_command_generator.flow_embeddings",
+                path=store.path,
+                model=store.model,
+                stored_flow_vectors=len(store),
+            )
+        return cached
+
+    create_embedder = getattr(flow_retrieval, "_create_embedder", None)
+    if create_embedder is not None:
+        flow_retrieval._create_embedder = lambda *args, **kwargs: wrap(create_embedder(*args, **kwargs))
+    if getattr(flow_retrieval, "embeddings", None) is not None:
+        flow_retrieval.embeddings = wrap(flow_retrieval.embeddings)
+    vector_store = getattr(flow_retrieval, "vector_store", None)
+    if vector_store is not None and getattr(vector_store, "embedding_function", None) is not None:
+        vector_store.embedding_function = wrap(vector_store.embedding_function)
+    return cached
+
+
+def dialogue_state(tracker: Optional[DialogueStateTracker], ignored_slots: List[Text]) -> Dict[Text, Any]:
+    """Bagian state dialog yang ikut menentukan jawaban LLM untuk pesan yang sama."""
+    if tracker is None:
+        return {}
+    active_flow = top_user_flow_frame(tracker.stack)
+    ignored = set(DEFAULT_SLOT_NAMES) | set(ignored_slots)
+    filled_slots = {
+        name: value for name, value in tracker.current_slot_values().items()
+        if value is not None and name not in ignored
+    }
+    latest_bot = tracker.latest_bot_utterance
+    last_bot_turn = None
+    if latest_bot is not None:
+        # Nama respons lebih stabil daripada teksnya (respons punya beberapa variasi).
+        last_bot_turn = (latest_bot.metadata or {}).get("utter_action") or latest_bot.text
+    return {
+        "active_flow": active_flow.flow_id if active_flow else None,
+        "slots": filled_slots,
+        "last_bot_turn": last_bot_turn,
+    }
+
+
+def _cacheable_text(message_text: Optional[Text], max_message_chars: int) -> bool:
+    normalized = normalize_message(message_text)
+    return bool(normalized) and len(normalized) <= max_message_chars
+
+
+@DefaultV1Recipe.register(
+    [DefaultV1Recipe.ComponentType.COMMAND_GENERATOR],
+    is_trainable=True,
+)
+class CachingCompactLLMCommandGenerator(CompactLLMCommandGenerator):
+    """CompactLLMCommandGenerator yang mengembalikan command dari cache untuk pesan berulang."""
+
+    @staticmethod
+    def get_default_config() -> Dict[Text, Any]:
+        return {
+            **CompactLLMCommandGenerator.get_default_config(),
+            RESPONSE_CACHE_CONFIG_KEY: dict(DEFAULT_RESPONSE_CACHE_CONFIG),
+            FLOW_EMBEDDINGS_CONFIG_KEY: dict(DEFAULT_FLOW_EMBEDDINGS_CONFIG),
+        }
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._cache_config = _cache_config(self.config)
+        self.response_cache = _build_cache(self._cache_config)
+        self.flow_embeddings = attach_cached_embeddings(
+            getattr(self, "flow_retrieval", None), self.config)
+        self.prompt_tokens = PromptTokenReport()
+
+    @classmethod
+    def load(
+        cls,
+        config: Dict[Text, Any],
+        model_storage: ModelStorage,
+        resource: Resource,
+        execution_context: ExecutionContext,
+        **kwargs: Any,
+    ) -> "CachingCompactLLMCommandGenerator":
+        # Load induk mengganti flow_retrieval dari __init__ dengan hasil
+        # FlowRetrieval.load, sehingga pembungkusnya harus dipasang ulang.
+        generator = super().load(config, model_storage, resource, execution_context, **kwargs)
+        generator.flow_embeddings = attach_cached_embeddings(
+            getattr(generator, "flow_retrieval", None), generator.config)
+        return generator
+
+    def render_template(self, *args: Any, **kwargs: Any) -> Text:
+        prompt = super().render_template(*args, **kwargs)
+        report = self.prompt_tokens.record(prompt)
+        structlogger.debug("caching_command_generator.prompt_tokens", **report)
+        return prompt
+
+    async def predict_commands(
+        self,
+        message: Message,
+        flows: FlowsList,
+        tracker: Optional[DialogueStateTracker] = None,
+        **kwargs: Any,
+    ) -> List[Command]:
+        message_text = message.get(TEXT)
+        if not _cacheable_text(message_text, self._cache_config["max_message_chars"]):
+            return await super().predict_commands(message, flows, tracker, **kwargs)
+
+        key = response_cache_key(
+            message_text, dialogue_state(tracker, self._cache_config["ignored_slots"]))
+
+        async def _predict() -> List[Command]:
+            return await super(CachingCompactLLMCommandGenerator, self).predict_commands(
+                message, flows, tracker, **kwargs)
+
+        commands = await self.response_cache.get_or_compute(
+            key,
+            _predict,
+            should_cache=cacheable_commands,
+        )
+        structlogger.debug(
+            "caching_command_generator.predict_commands",
+            cache_hits=self.response_cache.hits,
+            cache_misses=self.response_cache.misses,
+            commands=commands,
+        )
+        return commands
+
+
+@DefaultV1Recipe.register(
+    [DefaultV1Recipe.ComponentType.POLICY_WITH_END_TO_END_SUPPORT],
+    is_trainable=True,
+)
+class CachingIntentlessPolicy(IntentlessPolicy):
+    """IntentlessPolicy yang menyimpan respons terpilih untuk pesan berulang."""
+
+    @staticmethod
+    def get_default_config() -> Dict[Text, Any]:
+        return {
+            **IntentlessPolicy.get_default_config(),
+            RESPONSE_CACHE_CONFIG_KEY: dict(DEFAULT_RESPONSE_CACHE_CONFIG),
+        }
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._cache_config = _cache_config(self.config)
+        self.response_cache = _build_cache(self._cache_config)
+
+    async def find_closest_response(
+        self, tracker: DialogueStateTracker
+    ) -> Tuple[Optional[Text], Optional[float]]:
+        message_text = tracker.latest_message.text if tracker.latest_message else None
+        if not _cacheable_text(message_text, self._cache_config["max_message_chars"]):
+            return await super().find_closest_response(tracker)
+
+        key = response_cache_key(
+            message_text, dialogue_state(tracker, self._cache_config["ignored_slots"]))
+
+        async def _find() -> Tuple[Optional[Text], Optional[float]]:
+            return await super(CachingIntentlessPolicy, self).find_closest_response(tracker)
+
+        response, score = await self.response_cache.get_or_compute(
+            key, _find, should_cache=lambda result: result[0] is not None)
+        structlogger.debug(
+            "caching_intentless_policy.find_closest_response",
+            cache_hits=self.response_cache.hits,
+            cache_misses=self.response_cache.misses,
+            response=response,
+        )
+        return response, score
@@ -0,0 +1,274 @@
+"""Embedding deskripsi flow yang disimpan di disk dan cache embedding pesan.
+
+Deskripsi flow di `data/flows.yml` panjang dan jarang berubah, jadi vektornya
+cukup dihitung sekali saat `rasa train` lalu disimpan di satu file vektor
+ringkas (float32) yang di-memory-map saat startup. File mencatat identitas
+model embedding dan dimensinya; setelah model diganti, file lama dibuang dan
+deskripsi di-embed ulang. Pesan pengguna di-embed lewat cache LRU terbatas
+sehingga pesan berulang tidak memanggil API embedding lagi.
+
+Modul ini tidak bergantung pada Rasa; embedder apa pun yang punya
+`embed_documents` / `embed_query` (antarmuka LangChain) bisa dibungkus,
+termasuk `HashingEmbedder` lokal yang deterministik untuk pengujian:
+
+    embedder = HashingEmbedder(dim=64)
+    store = FlowEmbeddingStore("/tmp/flows.vec", embedder_identity(embedder))
+    embeddings = CachedEmbeddings(embedder, store)
+    embeddings.embed_documents(["Flow ini digunakan ketika ..."])
+"""
+import hashlib
+import math
+import mmap
+import os
+import re
+import struct
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Text
+
+_MAGIC = b"FEV2"
+_HEADER = struct.Struct("<4sIIH")  # magic, dimensi, jumlah vektor, panjang identitas model
+_KEY_SIZE = 20  # sha1 digest
+_FLOAT_SIZE = 4
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+_IDENTITY_ATTRIBUTES = ("provider", "model", "model_name", "deployment", "dimensions", "dim")
+
+
+def embedder_identity(embedder: Any) -> Text:
+    """Identitas model embedder dari kelas dan atribut model/provider/dimensinya.
+
+    Atribut juga dicari di client yang dibungkus (`client` / `_client`), seperti
+    pada adapter embedding Rasa.
+    """
+    parts = [type(embedder).__qualname__]
+    for source in (embedder, getattr(embedder, "client", None), getattr(embedder, "_client", None)):
+        if source is None:
+            continue
+        for name in _IDENTITY_ATTRIBUTES:
+            value = getattr(source, name, None)
+            if isinstance(value, (str, int)) and not isinstance(value, bool):
+                parts.append(f"{name}={value}")
+    return " ".join(parts)
+
+
+def text_key(text: Text, model: Text = "") -> bytes:
+    """Key vektor: sha1 dari model dan teks persis yang di-embed (salah satu berubah -> key berubah)."""
+    return hashlib.sha1(f"{model}\0{text}".encode("utf-8")).digest()
+
+
+class FlowEmbeddingStore:
+    """File vektor float32 yang di-memory-map, dialamatkan dengan hash teks.
+
+    Format: header, identitas model (UTF-8), lalu `count` digest sha1, lalu
+    matriks `count x dim` float32 little-endian. File dari model lain
+    diabaikan. Penulisan selalu lewat file sementara dan `os.replace`, jadi
+    pembaca tidak pernah melihat file setengah jadi.
+    """
+
+    def __init__(self, path: Text, model: Text = "") -> None:
+        self.path = path
+        self.model = model
+        self.dim = 0
+        self._index: Dict[bytes, int] = {}
+        self._mmap: Optional[mmap.mmap] = None
+        self._buffer: Optional[memoryview] = None
+        self._vectors: Optional[memoryview] = None
+        self._lock = threading.Lock()
+        self.load()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def load(self) -> None:
+        self.close()
+        try:
+            with open(self.path, "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            # ValueError: file kosong tidak bisa di-mmap.
+            return
+        header = _HEADER.unpack_from(mapped, 0) if len(mapped) >= _HEADER.size else (b"", 0, 0, 0)
+        magic, dim, count, model_size = header
+        keys_start = _HEADER.size + model_size
+        keys_end = keys_start + count * _KEY_SIZE
+        if magic != _MAGIC or len(mapped) != keys_end + count * dim * _FLOAT_SIZE:
+            print(f"Flow embedding file {self.path} is invalid, ignoring it.")
+            mapped.close()
+            return
+        model = mapped[_HEADER.size:keys_start].decode("utf-8", errors="replace")
+        if model != self.model:
+            print(f"Flow embedding file {self.path} was built with '{model}', "
+                  f"not '{self.model}', ignoring it.")
+            mapped.close()
+            return
+        self._mmap = mapped
+        self.dim = dim
+        self._index = {
+            bytes(mapped[keys_start + i * _KEY_SIZE:keys_start + (i + 1) * _KEY_SIZE]): i
+            for i in range(count)
+        }
+        self._buffer = memoryview(mapped)
+        self._vectors = self._buffer[keys_end:].cast("f")
+
+    def close(self) -> None:
+        if self._vectors is not None:
+            self._vectors.release()
+            self._vectors = None
+        if self._buffer is not None:
+            self._buffer.release()
+            self._buffer = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._index = {}
+        self.dim = 0
+
+    def get(self, text: Text) -> Optional[List[float]]:
+        row = self._index.get(text_key(text, self.model))
+        if row is None or self._vectors is None:
+            return None
+        return self._vectors[row * self.dim:(row + 1) * self.dim].tolist()
+
+    def add(self, texts: Sequence[Text], vectors: Sequence[Sequence[float]]) -> None:
+        """Tambahkan vektor baru lalu tulis ulang file (dipanggil saat train, bukan per pesan)."""
+        if not texts:
+            return
+        with self._lock:
+            dim = len(vectors[0])
+            rows: "OrderedDict[bytes, Sequence[float]]" = OrderedDict()
+            if self._vectors is not None and self.dim == dim:
+                for key, row in self._index.items():
+                    rows[key] = self._vectors[row * dim:(row + 1) * dim].tolist()
+            for text, vector in zip(texts, vectors):
+                rows[text_key(text, self.model)] = vector
+
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            model = self.model.encode("utf-8")
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(_HEADER.pack(_MAGIC, dim, len(rows), len(model)))
+                    f.write(model)
+                    f.write(b"".join(rows.keys()))
+                    for vector in rows.values():
+                        f.write(struct.pack(f"<{dim}f", *vector))
+                self.close()
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+            self.load()
+
+
+class CachedEmbeddings:
+    """Pembungkus embedder: deskripsi flow dari `FlowEmbeddingStore`, pesan dari cache LRU."""
+
+    def __init__(self, inner: Any, store: FlowEmbeddingStore, query_cache_size: int = 2048) -> None:
+        self.inner = inner
+        self.store = store
+        self.query_cache_size = query_cache_size
+        self._queries: "OrderedDict[Text, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.document_hits = 0
+        self.document_misses = 0
+        self.query_hits = 0
+        self.query_misses = 0
+
+    def __getattr__(self, name: Text) -> Any:
+        # Atribut lain (mis. konfigurasi model) diteruskan ke embedder asli.
+        if name == "inner":
+            raise AttributeError(name)
+        return getattr(self.inner, name)
+
+    def __call__(self, text: Text) -> List[float]:
+        # Vector store lama memanggil embedding function sebagai callable.
+        return self.embed_query(text)
+
+    def embed_documents(self, texts: List[Text]) -> List[List[float]]:
+        vectors: List[Optional[List[float]]] = [self.store.get(text) for text in texts]
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        self.document_hits += len(texts) - len(missing)
+        self.document_misses += len(missing)
+        if missing:
+            computed = self.inner.embed_documents([texts[i] for i in missing])
+            if computed and self.store.dim and len(computed[0]) != self.store.dim:
+                # Dimensi berubah tanpa identitas model berubah: vektor lama
+                # tidak bisa dicampur dengan yang baru, jadi embed ulang semua.
+                missing = list(range(len(texts)))
+                computed = self.inner.embed_documents(texts)
+            for i, vector in zip(missing, computed):
+                vectors[i] = list(vector)
+            self.store.add([texts[i] for i in missing], computed)
+        return vectors  # type: ignore[return-value]
+
+    def _cached_query(self, text: Text) -> Optional[List[float]]:
+        # Key adalah teks persis: normalisasi bisa menyamakan pesan yang
+        # berbeda (mis. semua pesan berisi emoji saja) padahal vektornya beda.
+        with self._lock:
+            vector = self._queries.get(text)
+            if vector is None:
+                self.query_misses += 1
+                return None
+            self._queries.move_to_end(text)
+            self.query_hits += 1
+            return list(vector)
+
+    def _remember_query(self, text: Text, vector: Sequence[float]) -> None:
+        if self.query_cache_size <= 0:
+            return
+        with self._lock:
+            self._queries[text] = list(vector)
+            self._queries.move_to_end(text)
+            while len(self._queries) > self.query_cache_size:
+                self._queries.popitem(last=False)
+
+    def embed_query(self, text: Text) -> List[float]:
+        vector = self._cached_query(text)
+        if vector is None:
+            vector = list(self.inner.embed_query(text))
+            self._remember_query(text, vector)
+        return vector
+
+    async def aembed_documents(self, texts: List[Text]) -> List[List[float]]:
+        return self.embed_documents(texts)
+
+    async def aembed_query(self, text: Text) -> List[float]:
+        vector = self._cached_query(text)
+        if vector is None:
+            if hasattr(self.inner, "aembed_query"):
+                vector = list(await self.inner.aembed_query(text))
+            else:
+                vector = list(self.inner.embed_query(text))
+            self._remember_query(text, vector)
+        return vector
+
+
+class HashingEmbedder:
+    """Embedder lokal deterministik (hashing kata + bigram karakter) untuk pengujian."""
+
+    def __init__(self, dim: int = 256) -> None:
+        self.dim = dim
+        self.calls = 0
+
+    def _embed(self, text: Text) -> List[float]:
+        vector = [0.0] * self.dim
+        for token in _TOKEN.findall(text.lower()):
+            features = [token] + [token[i:i + 2] for i in range(len(token) - 1)]
+            for feature in features:
+                digest = hashlib.md5(feature.encode("utf-8")).digest()
+                index = int.from_bytes(digest[:4], "little") % self.dim
+                vector[index] += 1.0 if digest[4] & 1 else -1.0
+        norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+        return [value / norm for value in vector]
+
+    def embed_documents(self, texts: List[Text]) -> List[List[float]]:
+        self.calls += len(texts)
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: Text) -> List[float]:
+        self.calls += 1
+        return self._embed(text)
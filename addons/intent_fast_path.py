@@ -0,0 +1,94 @@
+"""Jalur cepat NLU: intent yang sangat yakin langsung memulai flow tanpa LLM.
+
+Sapaan, salam penutup dan pertanyaan FAQ ("cara bayar online?", "gimana
+hubungi penjual?") dikenali DIETClassifier dengan confidence tinggi, jadi
+tidak perlu menunggu Gemini untuk memutuskan flow mana yang dimulai.
+
+Komponen ini harus diletakkan SEBELUM command generator LLM di pipeline:
+command generator berikutnya melewati pesan yang sudah punya command.
+
+    - name: addons.intent_fast_path.IntentFastPathCommandAdapter
+      threshold: 0.9
+      routes:
+        greet: greet_flow
+        ask_how_to_pay_online: ask_how_to_pay_online_flow
+"""
+from typing import Any, Dict, List, Optional, Text
+
+import structlog
+from rasa.dialogue_understanding.commands import Command, StartFlowCommand
+from rasa.dialogue_understanding.generator import NLUCommandAdapter
+from rasa.dialogue_understanding.stack.utils import top_user_flow_frame
+from rasa.engine.recipes.default_recipe import DefaultV1Recipe
+from rasa.shared.core.flows import FlowsList
+from rasa.shared.core.trackers import DialogueStateTracker
+from rasa.shared.nlu.constants import INTENT, INTENT_NAME_KEY, PREDICTED_CONFIDENCE_KEY
+from rasa.shared.nlu.training_data.message import Message
+
+structlogger = structlog.get_logger()
+
+DEFAULT_FAST_PATH_CONFIG = {
+    "threshold": 0.9,
+    # intent -> nama flow yang langsung dimulai.
+    "routes": {},
+}
+
+
+@DefaultV1Recipe.register(
+    [DefaultV1Recipe.ComponentType.COMMAND_GENERATOR],
+    is_trainable=False,
+)
+class IntentFastPathCommandAdapter(NLUCommandAdapter):
+    """NLUCommandAdapter yang memetakan intent yakin ke `start flow` lewat tabel `routes`."""
+
+    @staticmethod
+    def get_default_config() -> Dict[Text, Any]:
+        return {**NLUCommandAdapter.get_default_config(), **DEFAULT_FAST_PATH_CONFIG}
+
+    def __init__(self, config: Dict[Text, Any], *args: Any, **kwargs: Any) -> None:
+        super().__init__(config, *args, **kwargs)
+        config = {**DEFAULT_FAST_PATH_CONFIG, **(config or {})}
+        self.threshold = float(config["threshold"])
+        self.routes: Dict[Text, Text] = dict(config["routes"] or {})
+        self.fires: Dict[Text, int] = {}
+        self.passes = 0
+
+    def _route(
+        self, message: Message, flows: FlowsList, tracker: Optional[DialogueStateTracker]
+    ) -> Optional[Text]:
+        intent = message.get(INTENT) or {}
+        flow_id = self.routes.get(intent.get(INTENT_NAME_KEY))
+        if flow_id is None or (intent.get(PREDICTED_CONFIDENCE_KEY) or 0.0) < self.threshold:
+            return None
+        if flows.flow_by_id(flow_id) is None:
+            return None
+        if tracker is not None:
+            # Flow yang sedang berjalan tidak dimulai ulang; biarkan LLM yang memutuskan.
+            active_flow = top_user_flow_frame(tracker.stack)
+            if active_flow is not None and active_flow.flow_id == flow_id:
+                return None
+        return flow_id
+
+    async def predict_commands(
+        self,
+        message: Message,
+        flows: FlowsList,
+        tracker: Optional[DialogueStateTracker] = None,
+        **kwargs: Any,
+    ) -> List[Command]:
+        flow_id = self._route(message, flows, tracker)
+        if flow_id is None:
+            self.passes += 1
+            # Tetap dukung nlu_trigger bawaan di flows.yml.
+            return await super().predict_commands(message, flows, tracker, **kwargs)
+
+        intent_name = message.get(INTENT)[INTENT_NAME_KEY]
+        self.fires[intent_name] = self.fires.get(intent_name, 0) + 1
+        structlogger.info(
+            "intent_fast_path.fired",
+            intent=intent_name,
+            flow=flow_id,
+            fires=sum(self.fires.values()),
+            passes=self.passes,
+        )
+        return [StartFlowCommand(flow=flow_id)]
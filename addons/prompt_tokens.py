@@ -0,0 +1,131 @@
+"""Hitung token prompt command generator, total dan per bagian `## ...`.
+
+Dipakai `CachingCompactLLMCommandGenerator` untuk mencatat jumlah token tiap
+prompt yang dirender, dan bisa dijalankan langsung untuk membandingkan prompt
+lengkap dengan prompt yang dipangkas per flow:
+
+    python -m addons.prompt_tokens --flows product_search_flow check_order_status_flow
+
+Jumlah token memakai tokenizer `cl100k_base` dari tiktoken bila terpasang;
+tanpa tiktoken dipakai perkiraan kata + tanda baca. Tokenizer Gemini berbeda,
+jadi angka ini untuk perbandingan antar prompt, bukan tagihan persis.
+"""
+import argparse
+import os
+import re
+from typing import Any, Dict, List, Optional, Sequence, Text
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_APPROX_TOKEN = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+_SECTION = re.compile(r"^## (.+)$", re.MULTILINE)
+
+try:
+    import tiktoken
+
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+    TOKENIZER = "tiktoken/cl100k_base"
+except Exception:  # tiktoken tidak terpasang atau encoding tidak bisa diunduh
+    _ENCODING = None
+    TOKENIZER = "approx"
+
+
+def count_tokens(text: Text) -> int:
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text))
+    return len(_APPROX_TOKEN.findall(text))
+
+
+def section_tokens(prompt: Text) -> Dict[Text, int]:
+    """Token per bagian `## Judul`; teks sebelum judul pertama masuk ke "(awal)"."""
+    sections: Dict[Text, int] = {}
+    matches = list(_SECTION.finditer(prompt))
+    if not matches or matches[0].start() > 0:
+        sections["(awal)"] = count_tokens(prompt[:matches[0].start() if matches else len(prompt)])
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(prompt)
+        sections[match.group(1).strip()] = count_tokens(prompt[match.start():end])
+    return sections
+
+
+class PromptTokenReport:
+    """Ringkasan berjalan jumlah token prompt yang dirender."""
+
+    def __init__(self) -> None:
+        self.prompts = 0
+        self.total_tokens = 0
+        self.max_tokens = 0
+
+    def record(self, prompt: Text) -> Dict[Text, Any]:
+        sections = section_tokens(prompt)
+        tokens = count_tokens(prompt)
+        self.prompts += 1
+        self.total_tokens += tokens
+        self.max_tokens = max(self.max_tokens, tokens)
+        return {
+            "tokens": tokens,
+            "chars": len(prompt),
+            "sections": sections,
+            "tokenizer": TOKENIZER,
+            "mean_tokens": self.total_tokens / self.prompts,
+            "max_tokens": self.max_tokens,
+        }
+
+
+def _load_flows(flows_path: Text) -> List[Dict[Text, Text]]:
+    import yaml
+
+    with open(flows_path, encoding="utf-8") as f:
+        flows = (yaml.safe_load(f) or {}).get("flows") or {}
+    return [{"name": name, "description": (flow or {}).get("description", "")}
+            for name, flow in flows.items()]
+
+
+def render_prompt(template_path: Text, available_flows: Sequence[Dict[Text, Text]],
+                  user_message: Text = "halo") -> Text:
+    from jinja2 import Template
+
+    with open(template_path, encoding="utf-8") as f:
+        template = Template(f.read())
+    return template.render(
+        available_flows=list(available_flows),
+        current_conversation=f"USER: {user_message}",
+        user_message=user_message,
+    )
+
+
+def main(argv: Optional[Sequence[Text]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--template", default=os.path.join(PROJECT_ROOT, "prompts", "command_generator.jinja2"))
+    parser.add_argument("--flows-file", default=os.path.join(PROJECT_ROOT, "data", "flows.yml"))
+    parser.add_argument("--flows", nargs="*", default=None,
+                        help="Flow hasil retrieval; default tiap flow diukur satu per satu.")
+    parser.add_argument("--sections", action="store_true", help="Tampilkan token per bagian.")
+    args = parser.parse_args(argv)
+
+    all_flows = _load_flows(args.flows_file)
+    scenarios = {"(semua flow)": all_flows}
+    if args.flows is not None:
+        scenarios[" + ".join(args.flows) or "(tanpa flow)"] = [
+            flow for flow in all_flows if flow["name"] in args.flows]
+    else:
+        for flow in all_flows:
+            scenarios[flow["name"]] = [flow]
+
+    full_tokens = None
+    print(f"Tokenizer: {TOKENIZER}")
+    print(f"{'flow':<40}{'token':>8}{'hemat':>8}")
+    for name, flows in scenarios.items():
+        prompt = render_prompt(args.template, flows)
+        tokens = count_tokens(prompt)
+        if full_tokens is None:
+            full_tokens = tokens
+        saved = 1 - tokens / full_tokens if full_tokens else 0.0
+        print(f"{name:<40}{tokens:>8}{saved:>8.0%}")
+        if args.sections:
+            for section, section_count in section_tokens(prompt).items():
+                print(f"    {section:<36}{section_count:>8}")
+
+
+if __name__ == "__main__":
+    main()
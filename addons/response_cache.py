@@ -0,0 +1,131 @@
+"""Cache hasil LLM yang dibatasi ukuran dan umur, beserta pembentuk key-nya.
+
+Modul ini tidak bergantung pada Rasa sehingga bisa diuji langsung dengan
+LLM palsu lokal, misalnya:
+
+    cache = BoundedTTLCache(max_size=100, ttl=60)
+    key = response_cache_key("Halo!", {"active_flow": None})
+    commands = await cache.get_or_compute(key, fake_llm)
+"""
+import asyncio
+import copy
+import hashlib
+import json
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Text, Tuple
+
+_NON_ALPHANUMERIC = re.compile(r"[^0-9a-z]+")
+
+# Command yang menandakan kegagalan LLM tidak boleh di-cache.
+UNCACHEABLE_COMMANDS = frozenset({"ErrorCommand", "CannotHandleCommand"})
+
+
+def normalize_message(text: Optional[Text]) -> Text:
+    """Huruf kecil, tanda baca dan spasi berlebih dibuang: "Halo!!" dan "halo" menjadi sama."""
+    return _NON_ALPHANUMERIC.sub(" ", (text or "").lower()).strip()
+
+
+def response_cache_key(message: Text, dialogue_state: Dict[Text, Any]) -> Text:
+    """Key stabil dari pesan yang sudah dinormalisasi dan state dialog yang relevan."""
+    payload = json.dumps(
+        [normalize_message(message), dialogue_state], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def cacheable_commands(commands: Any) -> bool:
+    """True jika daftar command layak di-cache: tidak kosong dan tanpa command kegagalan.
+
+    Dicek lewat nama kelas agar modul ini tetap bebas dari import Rasa.
+    """
+    return bool(commands) and not any(
+        type(command).__name__ in UNCACHEABLE_COMMANDS for command in commands)
+
+
+class BoundedTTLCache:
+    """Cache LRU dengan TTL per entri.
+
+    Entri yang kedaluwarsa dibuang saat dibaca; jika jumlah entri melewati
+    `max_size`, entri yang paling lama tidak dipakai dibuang lebih dulu.
+    Nilai disalin (deepcopy) saat disimpan dan saat dikembalikan agar
+    pemanggil tidak bisa mengubah isi cache.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1000,
+        ttl: float = 600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._pending: Dict[Hashable, "asyncio.Future[Any]"] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if self._clock() >= expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return copy.deepcopy(value)
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if self.max_size <= 0:
+            return
+        self._entries[key] = (self._clock() + self.ttl, copy.deepcopy(value))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def get_or_compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], Awaitable[Any]],
+        should_cache: Callable[[Any], bool] = lambda value: value is not None,
+    ) -> Any:
+        """Nilai dari cache, atau hasil `compute()` yang lalu disimpan.
+
+        Pemanggil bersamaan dengan key yang sama menunggu satu `compute()`
+        yang sama, jadi satu pesan populer tidak memicu beberapa panggilan LLM.
+        """
+        cached = self.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        pending = self._pending.get(key)
+        if pending is not None:
+            self.hits += 1
+            return copy.deepcopy(await asyncio.shield(pending))
+
+        self.misses += 1
+        future: "asyncio.Future[Any]" = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            value = await compute()
+        except BaseException as e:
+            future.set_exception(e)
+            # Hindari warning "exception was never retrieved" jika tidak ada penunggu lain.
+            future.exception()
+            raise
+        else:
+            if should_cache(value):
+                self.set(key, value)
+            future.set_result(value)
+            return value
+        finally:
+            self._pending.pop(key, None)
@@ -0,0 +1,156 @@
+"""Tracker store SQLite yang memadatkan riwayat event per pengguna.
+
+Tracker store bawaan (in-memory) menyimpan semua event setiap percakapan
+selamanya, dan seluruh tracker ikut dikirim ke action server pada tiap
+panggilan action. Store ini menyimpan tracker di file SQLite lokal dan,
+begitu jumlah event seorang pengguna melewati `max_events`, memotong event
+lama menjadi satu snapshot state (slot, termasuk dialogue stack, dan loop
+aktif) yang diikuti `keep_events` event terakhir. Pemotongan selalu di awal
+giliran pengguna agar satu giliran tidak terbelah.
+
+Contoh di endpoints.yml:
+
+    tracker_store:
+      type: addons.tracker_store.CompactingSQLiteTrackerStore
+      db: .rasa/trackers.db
+      max_events: 400
+      keep_events: 200
+"""
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Iterable, List, Optional, Text, Tuple
+
+import structlog
+from rasa.core.tracker_store import SerializedTrackerAsText, TrackerStore
+from rasa.shared.core.constants import ACTION_LISTEN_NAME, ACTION_SESSION_START_NAME
+from rasa.shared.core.domain import Domain
+from rasa.shared.core.events import (
+    ActionExecuted,
+    ActiveLoop,
+    Event,
+    SessionStarted,
+    SlotSet,
+    UserUttered,
+)
+from rasa.shared.core.trackers import (
+    DialogueStateTracker,
+    get_trackers_for_conversation_sessions,
+)
+
+structlogger = structlog.get_logger()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS trackers (
+    sender_id TEXT PRIMARY KEY,
+    tracker TEXT NOT NULL,
+    compacted_events INTEGER NOT NULL DEFAULT 0,
+    compactions INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL NOT NULL
+)
+"""
+
+
+class CompactingSQLiteTrackerStore(TrackerStore, SerializedTrackerAsText):
+    """Tracker store SQLite dengan batas jumlah event per pengguna."""
+
+    def __init__(
+        self,
+        domain: Domain,
+        event_broker: Optional[Any] = None,
+        db: Text = ".rasa/trackers.db",
+        max_events: int = 400,
+        keep_events: int = 200,
+        **kwargs: Any,
+    ) -> None:
+        if not 0 < int(keep_events) <= int(max_events):
+            raise ValueError("keep_events harus lebih dari 0 dan tidak lebih dari max_events.")
+        self.db = db
+        self.max_events = int(max_events)
+        self.keep_events = int(keep_events)
+        directory = os.path.dirname(os.path.abspath(db))
+        os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(db, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(_SCHEMA)
+        self._lock = threading.Lock()
+        super().__init__(domain, event_broker, **kwargs)
+
+    def _execute(self, sql: Text, params: Tuple[Any, ...] = ()) -> List[Tuple[Any, ...]]:
+        # Query SQLite lokal cukup cepat untuk dijalankan langsung, seperti SQLTrackerStore.
+        with self._lock:
+            return self._connection.execute(sql, params).fetchall()
+
+    def _snapshot(self, events: List[Event], sender_id: Text) -> List[Event]:
+        """Event pengganti `events`: sesi baru dengan state akhir dari event tersebut."""
+        state = DialogueStateTracker.from_events(sender_id, events, slots=self.domain.slots)
+        timestamp = events[-1].timestamp
+        snapshot: List[Event] = [
+            ActionExecuted(ACTION_SESSION_START_NAME, timestamp=timestamp),
+            SessionStarted(timestamp=timestamp),
+        ]
+        for name, slot in state.slots.items():
+            if slot.value != slot.initial_value:
+                snapshot.append(SlotSet(name, slot.value, timestamp=timestamp))
+        if state.active_loop_name:
+            snapshot.append(ActiveLoop(state.active_loop_name, timestamp=timestamp))
+        snapshot.append(ActionExecuted(ACTION_LISTEN_NAME, timestamp=timestamp))
+        return snapshot
+
+    def compact(self, tracker: DialogueStateTracker) -> Tuple[DialogueStateTracker, int]:
+        """Tracker yang sudah dipadatkan beserta jumlah event yang dibuang."""
+        events = list(tracker.events)
+        if len(events) <= self.max_events:
+            return tracker, 0
+
+        cut = len(events) - self.keep_events
+        while cut < len(events) and not isinstance(events[cut], UserUttered):
+            cut += 1
+        if cut >= len(events):
+            # Tidak ada awal giliran pengguna di ekor riwayat; tunggu giliran berikutnya.
+            return tracker, 0
+
+        snapshot = self._snapshot(events[:cut], tracker.sender_id)
+        compacted = DialogueStateTracker.from_events(
+            tracker.sender_id, snapshot + events[cut:], slots=self.domain.slots)
+        return compacted, cut
+
+    async def save(self, tracker: DialogueStateTracker) -> None:
+        await self.stream_events(tracker)
+        tracker, dropped = self.compact(tracker)
+        if dropped:
+            structlogger.info(
+                "compacting_tracker_store.compacted",
+                sender_id=tracker.sender_id,
+                dropped_events=dropped,
+                retained_events=len(tracker.events),
+            )
+        self._execute(
+            "INSERT INTO trackers (sender_id, tracker, compacted_events, compactions, updated_at) "
+            "VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(sender_id) DO UPDATE SET tracker = excluded.tracker, "
+            "compacted_events = compacted_events + excluded.compacted_events, "
+            "compactions = compactions + excluded.compactions, updated_at = excluded.updated_at",
+            (tracker.sender_id, self.serialise_tracker(tracker), dropped,
+             1 if dropped else 0, time.time()),
+        )
+
+    async def _retrieve(
+        self, sender_id: Text, fetch_all_sessions: bool
+    ) -> Optional[DialogueStateTracker]:
+        rows = self._execute("SELECT tracker FROM trackers WHERE sender_id = ?", (sender_id,))
+        if not rows:
+            return None
+        tracker = self.deserialise_tracker(sender_id, rows[0][0])
+        if not tracker or fetch_all_sessions:
+            return tracker
+        sessions = get_trackers_for_conversation_sessions(tracker)
+        return sessions[-1] if len(sessions) > 1 else tracker
+
+    async def keys(self) -> Iterable[Text]:
+        return [row[0] for row in self._execute("SELECT sender_id FROM trackers")]
+
+    async def delete(self, sender_id: Text) -> None:
+        self._execute("DELETE FROM trackers WHERE sender_id = ?", (sender_id,))
@@ -0,0 +1,219 @@
+"""Load generator untuk endpoint `/webhook` action server.
+
+Mengirim payload tracker yang realistis (entity, slot, metadata authToken dan
+riwayat event) dengan campuran action yang bisa diatur, lalu melaporkan
+throughput serta latensi p50/p95/p99 per action:
+
+    python -m benchmarks.load_generator --url http://localhost:5055/webhook \
+        --concurrency 50 --duration 30
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Text, Tuple
+
+import aiohttp
+
+RASA_VERSION = "3.12.14"
+
+# (nama action, bobot, entity yang dikirim)
+DEFAULT_SCENARIOS: Sequence[Tuple[Text, float, Optional[Tuple[Text, Sequence[Text]]]]] = (
+    ("action_recommend_products", 3.0, None),
+    ("action_list_products_api", 2.0, None),
+    ("action_search_product_api", 3.0, ("product_name", ["ayam bakar madu", "ayam bakr",
+                                                          "es teh", "nasi uduk", "pizza"])),
+    ("action_show_product_detail", 2.0, ("product_name", ["Ayam Bakar Madu", "Es Teh Pedas",
+                                                          "Sate Ayam Kecap"])),
+    ("action_list_shops_api", 1.0, None),
+    ("action_search_shop_api", 1.0, ("shop_name", ["serpong", "cabang depok", "bekasi"])),
+    ("action_check_order_status", 1.5, None),
+    ("action_check_payment_status", 1.5, None),
+)
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def build_action_call(
+    action_name: Text,
+    sender_id: Text,
+    entity: Optional[Tuple[Text, Text]] = None,
+    history_events: int = 20,
+) -> Dict[Text, Any]:
+    entities = []
+    slots: Dict[Text, Any] = {"product_name_slot": None, "shop_name_slot": None}
+    text = "halo"
+    if entity:
+        entity_name, value = entity
+        entities.append({"entity": entity_name, "value": value, "start": 0,
+                         "end": len(value), "extractor": "DIETClassifier"})
+        slots[f"{entity_name}_slot"] = value
+        text = value
+    latest_message = {
+        "text": text,
+        "intent": {"name": "benchmark", "confidence": 0.99},
+        "entities": entities,
+        "metadata": {"authToken": f"bench-token-{sender_id}"},
+    }
+    events: List[Dict[Text, Any]] = [{"event": "action", "name": "action_session_start"}]
+    for i in range(history_events):
+        events.append({"event": "user", "text": f"pesan ke-{i}", "parse_data": latest_message})
+        events.append({"event": "bot", "text": "Baik, ini jawabannya."})
+    return {
+        "next_action": action_name,
+        "sender_id": sender_id,
+        "version": RASA_VERSION,
+        "domain": {},
+        "tracker": {
+            "sender_id": sender_id,
+            "slots": slots,
+            "latest_message": latest_message,
+            "latest_event_time": time.time(),
+            "followup_action": None,
+            "paused": False,
+            "events": events,
+            "latest_input_channel": "rest",
+            "active_loop": {},
+            "latest_action": {"action_name": "action_listen"},
+            "latest_action_name": "action_listen",
+        },
+    }
+
+
+@dataclass
+class LoadReport:
+    elapsed: float = 0.0
+    latencies: Dict[Text, List[float]] = field(default_factory=lambda: defaultdict(list))
+    errors: Dict[Text, int] = field(default_factory=lambda: defaultdict(int))
+
+    def summary(self) -> Dict[Text, Any]:
+        actions = {}
+        total = 0
+        for action_name in sorted(set(self.latencies) | set(self.errors)):
+            values = sorted(self.latencies.get(action_name, []))
+            total += len(values)
+            actions[action_name] = {
+                "requests": len(values),
+                "errors": self.errors.get(action_name, 0),
+                "p50_ms": percentile(values, 50) * 1000,
+                "p95_ms": percentile(values, 95) * 1000,
+                "p99_ms": percentile(values, 99) * 1000,
+            }
+        return {
+            "elapsed_s": self.elapsed,
+            "requests": total,
+            "throughput_rps": total / self.elapsed if self.elapsed else 0.0,
+            "actions": actions,
+        }
+
+    def format(self) -> Text:
+        summary = self.summary()
+        lines = [
+            f"{summary['requests']} requests dalam {summary['elapsed_s']:.1f}s "
+            f"({summary['throughput_rps']:.1f} req/s)",
+            f"{'action':<32}{'req':>7}{'err':>6}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}",
+        ]
+        for action_name, stats in summary["actions"].items():
+            lines.append(
+                f"{action_name:<32}{stats['requests']:>7}{stats['errors']:>6}"
+                f"{stats['p50_ms']:>9.1f}{stats['p95_ms']:>9.1f}{stats['p99_ms']:>9.1f}")
+        return "\n".join(lines)
+
+
+async def run_load(
+    url: Text,
+    concurrency: int = 20,
+    duration: Optional[float] = 10.0,
+    total_requests: Optional[int] = None,
+    users: int = 200,
+    history_events: int = 20,
+    scenarios: Sequence[Tuple[Text, float, Optional[Tuple[Text, Sequence[Text]]]]] = DEFAULT_SCENARIOS,
+    seed: int = 7,
+) -> LoadReport:
+    rng = random.Random(seed)
+    report = LoadReport()
+    weights = [weight for _, weight, _ in scenarios]
+    remaining = [total_requests]
+    deadline = time.perf_counter() + duration if duration else None
+
+    def next_call() -> Optional[Tuple[Text, bytes]]:
+        if remaining[0] is not None:
+            if remaining[0] <= 0:
+                return None
+            remaining[0] -= 1
+        elif deadline is not None and time.perf_counter() >= deadline:
+            return None
+        action_name, _, entity_spec = rng.choices(scenarios, weights=weights)[0]
+        entity = (entity_spec[0], rng.choice(entity_spec[1])) if entity_spec else None
+        sender_id = f"bench-user-{rng.randrange(users)}"
+        payload = build_action_call(action_name, sender_id, entity, history_events)
+        return action_name, json.dumps(payload).encode("utf-8")
+
+    async def worker(session: aiohttp.ClientSession) -> None:
+        while True:
+            call = next_call()
+            if call is None:
+                return
+            action_name, body = call
+            started = time.perf_counter()
+            try:
+                async with session.post(url, data=body,
+                                        headers={"Content-Type": "application/json"}) as response:
+                    await response.read()
+                    if response.status != 200:
+                        report.errors[action_name] += 1
+                        continue
+            except aiohttp.ClientError:
+                report.errors[action_name] += 1
+                continue
+            report.latencies[action_name].append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        await asyncio.gather(*(worker(session) for _ in range(concurrency)))
+    report.elapsed = time.perf_counter() - started
+    return report
+
+
+def add_load_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=10.0,
+                        help="Lama pengujian dalam detik (diabaikan jika --requests diisi).")
+    parser.add_argument("--requests", type=int, default=None)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--history-events", type=int, default=20,
+                        help="Jumlah pasangan event user/bot di tracker tiap request.")
+    parser.add_argument("--json", dest="json_output", default=None,
+                        help="Simpan ringkasan hasil ke file JSON ini.")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://localhost:5055/webhook")
+    add_load_arguments(parser)
+    args = parser.parse_args()
+    report = asyncio.run(run_load(
+        args.url,
+        concurrency=args.concurrency,
+        duration=None if args.requests else args.duration,
+        total_requests=args.requests,
+        users=args.users,
+        history_events=args.history_events,
+    ))
+    print(report.format())
+    if args.json_output:
+        with open(args.json_output, "w", encoding="utf-8") as f:
+            json.dump(report.summary(), f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
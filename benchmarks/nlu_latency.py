@@ -0,0 +1,287 @@
+"""Benchmark latensi inferensi NLU untuk beberapa varian pipeline.
+
+Melatih model NLU untuk tiap varian pipeline (turunan dari `config.yml`),
+lalu memutar ulang setiap contoh di `data/nlu.yml` lewat `Agent.parse_message`
+dan melaporkan latensi p50/p99 per pesan, throughput, akurasi intent serta
+memori yang dipakai model:
+
+    python -m benchmarks.nlu_latency --variants baseline char_ngram_1_3 diet_1_layer
+
+Tiap varian diukur di subprocess sendiri agar angka memori tidak tercampur.
+Komponen command generator (LLM maupun adapter NLU) tidak ikut
+dilatih karena yang diukur hanya jalur NLU klasik.
+"""
+import argparse
+import asyncio
+import copy
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Text, Tuple
+
+import yaml
+
+from .load_generator import percentile
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_ENTITY_ANNOTATION = re.compile(r"\[([^\]]+)\](?:\([^)]*\)|\{[^}]*\})")
+
+Pipeline = List[Dict[Text, Any]]
+
+
+def _is_llm_component(name: Text) -> bool:
+    # Termasuk subclass kustom seperti addons...CachingCompactLLMCommandGenerator
+    # dan addons...IntentFastPathCommandAdapter.
+    class_name = name.rsplit(".", 1)[-1]
+    return class_name.endswith(("LLMCommandGenerator", "CommandAdapter"))
+
+
+def _component(pipeline: Pipeline, name: Text, **match: Any) -> Dict[Text, Any]:
+    for component in pipeline:
+        if component.get("name") == name and all(component.get(k) == v for k, v in match.items()):
+            return component
+    raise KeyError(f"Komponen {name} {match or ''} tidak ada di pipeline.")
+
+
+def _char_ngrams(max_ngram: int) -> Callable[[Pipeline], None]:
+    def apply(pipeline: Pipeline) -> None:
+        _component(pipeline, "CountVectorsFeaturizer", analyzer="char_wb")["max_ngram"] = max_ngram
+    return apply
+
+
+def _diet_layers(layers: int) -> Callable[[Pipeline], None]:
+    def apply(pipeline: Pipeline) -> None:
+        _component(pipeline, "DIETClassifier")["number_of_transformer_layers"] = layers
+    return apply
+
+
+def _without_char_ngrams(pipeline: Pipeline) -> None:
+    pipeline.remove(_component(pipeline, "CountVectorsFeaturizer", analyzer="char_wb"))
+
+
+# Nama varian -> perubahan terhadap pipeline NLU di config.yml.
+VARIANTS: Dict[Text, Callable[[Pipeline], None]] = {
+    "baseline": lambda pipeline: None,
+    "char_ngram_1_3": _char_ngrams(3),
+    "char_ngram_1_2": _char_ngrams(2),
+    "no_char_ngrams": _without_char_ngrams,
+    "diet_1_layer": _diet_layers(1),
+    "diet_no_transformer": _diet_layers(0),
+}
+
+
+def nlu_pipeline(config_path: Text) -> Tuple[Dict[Text, Any], Pipeline]:
+    with open(config_path, encoding="utf-8") as f:
+        config = yaml.safe_load(f)
+    pipeline = [component for component in config.get("pipeline", [])
+                if not _is_llm_component(component.get("name", ""))]
+    return config, pipeline
+
+
+def variant_config(config_path: Text, variant: Text) -> Dict[Text, Any]:
+    config, pipeline = nlu_pipeline(config_path)
+    pipeline = copy.deepcopy(pipeline)
+    VARIANTS[variant](pipeline)
+    return {
+        "recipe": config.get("recipe", "default.v1"),
+        "language": config.get("language", "id"),
+        "assistant_id": f"nlu-benchmark-{variant}",
+        "pipeline": pipeline,
+        "policies": [],
+    }
+
+
+def load_examples(nlu_path: Text) -> List[Tuple[Text, Text]]:
+    """Semua contoh (teks tanpa anotasi entity, intent) dari file NLU YAML."""
+    with open(nlu_path, encoding="utf-8") as f:
+        data = yaml.safe_load(f)
+    examples = []
+    for block in data.get("nlu", []):
+        intent = block.get("intent")
+        if not intent:
+            continue
+        for line in (block.get("examples") or "").splitlines():
+            line = line.strip()
+            if line.startswith("- "):
+                examples.append((_ENTITY_ANNOTATION.sub(r"\1", line[2:].strip()), intent))
+    return examples
+
+
+def split_holdout(
+    nlu_path: Text, fraction: float, seed: int, train_path: Text
+) -> List[Tuple[Text, Text]]:
+    """Pisahkan `fraction` contoh tiap intent sebagai data uji dan tulis sisanya ke `train_path`."""
+    with open(nlu_path, encoding="utf-8") as f:
+        data = yaml.safe_load(f)
+    rng = random.Random(seed)
+    held_out: List[Tuple[Text, Text]] = []
+    for block in data.get("nlu", []):
+        intent = block.get("intent")
+        if not intent:
+            continue
+        lines = [line for line in (block.get("examples") or "").splitlines() if line.strip()]
+        rng.shuffle(lines)
+        n_test = int(len(lines) * fraction)
+        for line in lines[:n_test]:
+            held_out.append((_ENTITY_ANNOTATION.sub(r"\1", line.strip()[2:].strip()), intent))
+        block["examples"] = "\n".join(lines[n_test:]) + "\n"
+    with open(train_path, "w", encoding="utf-8") as f:
+        yaml.safe_dump(data, f, allow_unicode=True, sort_keys=False)
+    return held_out
+
+
+def train_variant(config: Dict[Text, Any], nlu_path: Text, out_dir: Text, variant: Text) -> Text:
+    config_path = os.path.join(out_dir, f"config-{variant}.yml")
+    with open(config_path, "w", encoding="utf-8") as f:
+        yaml.safe_dump(config, f, allow_unicode=True, sort_keys=False)
+    subprocess.run(
+        ["rasa", "train", "nlu", "--config", config_path, "--nlu", nlu_path,
+         "--out", out_dir, "--fixed-model-name", f"nlu-{variant}"],
+        cwd=PROJECT_ROOT,
+        check=True,
+    )
+    return os.path.join(out_dir, f"nlu-{variant}.tar.gz")
+
+
+def _rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        import resource
+        # ru_maxrss dalam KiB di Linux (puncak, bukan nilai saat ini).
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+async def _measure(model_path: Text, examples: Sequence[Tuple[Text, Text]], warmup: int) -> Dict[Text, Any]:
+    from rasa.core.agent import Agent
+
+    rss_before = _rss_bytes()
+    load_started = time.perf_counter()
+    agent = Agent.load(model_path)
+    load_seconds = time.perf_counter() - load_started
+    rss_model = _rss_bytes() - rss_before
+
+    for text, _ in examples[:warmup]:
+        await agent.parse_message(text)
+
+    latencies = []
+    correct = 0
+    started = time.perf_counter()
+    for text, intent in examples:
+        message_started = time.perf_counter()
+        parsed = await agent.parse_message(text)
+        latencies.append(time.perf_counter() - message_started)
+        if (parsed.get("intent") or {}).get("name") == intent:
+            correct += 1
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "examples": len(examples),
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "throughput_mps": len(examples) / elapsed if elapsed else 0.0,
+        "intent_accuracy": correct / len(examples) if examples else 0.0,
+        "model_rss_mb": rss_model / 1024 / 1024,
+        "load_s": load_seconds,
+        "model_file_mb": os.path.getsize(model_path) / 1024 / 1024,
+    }
+
+
+def measure_in_subprocess(
+    model_path: Text, examples: Sequence[Tuple[Text, Text]], warmup: int, work_dir: Text
+) -> Dict[Text, Any]:
+    examples_path = os.path.join(work_dir, "examples.json")
+    result_path = os.path.join(work_dir, "result.json")
+    with open(examples_path, "w", encoding="utf-8") as f:
+        json.dump(examples, f)
+    subprocess.run(
+        [sys.executable, "-m", "benchmarks.nlu_latency", "--measure", model_path,
+         "--examples-file", examples_path, "--warmup", str(warmup), "--json", result_path],
+        cwd=PROJECT_ROOT,
+        check=True,
+    )
+    with open(result_path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def format_report(results: Dict[Text, Dict[Text, Any]]) -> Text:
+    lines = [
+        f"{'varian':<22}{'contoh':>7}{'p50 ms':>9}{'p99 ms':>9}{'msg/s':>9}"
+        f"{'akurasi':>9}{'RSS MB':>9}{'file MB':>9}",
+    ]
+    for variant, stats in results.items():
+        lines.append(
+            f"{variant:<22}{stats['examples']:>7}{stats['p50_ms']:>9.2f}{stats['p99_ms']:>9.2f}"
+            f"{stats['throughput_mps']:>9.1f}{stats['intent_accuracy']:>9.3f}"
+            f"{stats['model_rss_mb']:>9.1f}{stats['model_file_mb']:>9.1f}")
+    return "\n".join(lines)
+
+
+def _run(args: argparse.Namespace) -> None:
+    if args.measure:
+        with open(args.examples_file, encoding="utf-8") as f:
+            examples = [tuple(example) for example in json.load(f)]
+        result = asyncio.run(_measure(args.measure, examples, args.warmup))
+        with open(args.json_output, "w", encoding="utf-8") as f:
+            json.dump(result, f)
+        return
+
+    out_dir = args.models_dir or tempfile.mkdtemp(prefix="nlu-benchmark-")
+    os.makedirs(out_dir, exist_ok=True)
+    nlu_path = os.path.join(PROJECT_ROOT, args.nlu)
+    if args.holdout > 0:
+        train_path = os.path.join(out_dir, "nlu-train.yml")
+        examples = split_holdout(nlu_path, args.holdout, args.seed, train_path)
+    else:
+        # Tanpa holdout, akurasi diukur pada data latih sendiri (batas atas).
+        train_path = nlu_path
+        examples = load_examples(nlu_path)
+
+    results: Dict[Text, Dict[Text, Any]] = {}
+    for variant in args.variants:
+        model_path = os.path.join(out_dir, f"nlu-{variant}.tar.gz")
+        if not (args.skip_train and os.path.exists(model_path)):
+            print(f"Melatih varian '{variant}'...")
+            model_path = train_variant(
+                variant_config(os.path.join(PROJECT_ROOT, args.config), variant),
+                train_path, out_dir, variant)
+        print(f"Mengukur varian '{variant}' ({len(examples)} pesan)...")
+        results[variant] = measure_in_subprocess(model_path, examples, args.warmup, out_dir)
+
+    print(format_report(results))
+    print(f"\nModel tersimpan di {out_dir}")
+    if args.json_output:
+        with open(args.json_output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+def main(argv: Optional[Sequence[Text]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--variants", nargs="+", choices=sorted(VARIANTS),
+                        default=["baseline", "char_ngram_1_3", "diet_1_layer"])
+    parser.add_argument("--config", default="config.yml")
+    parser.add_argument("--nlu", default=os.path.join("data", "nlu.yml"))
+    parser.add_argument("--models-dir", default=None,
+                        help="Direktori model hasil latih; default direktori sementara.")
+    parser.add_argument("--skip-train", action="store_true",
+                        help="Pakai model yang sudah ada di --models-dir bila tersedia.")
+    parser.add_argument("--holdout", type=float, default=0.0,
+                        help="Porsi contoh per intent yang disisihkan sebagai data uji (0-1).")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--json", dest="json_output", default=None)
+    parser.add_argument("--measure", default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--examples-file", default=None, help=argparse.SUPPRESS)
+    _run(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Jalankan stub backend, action server dan load generator sekaligus.
+
+    python -m benchmarks.run --catalog-size 500 --latency-ms 40 --concurrency 50 --duration 30
+
+Action server dijalankan sebagai subprocess (`python -m rasa_sdk`) dengan
+API_ROOT_URL diarahkan ke stub, sehingga yang diukur adalah kode `actions/`
+apa adanya. Di akhir dicetak latensi per action dan jumlah request yang
+sampai ke stub per endpoint.
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Text
+
+import aiohttp
+from aiohttp import web
+
+from .load_generator import add_load_arguments, run_load
+from .stub_backend import add_stub_arguments, create_stub_app, stub_config_from_args
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+async def _wait_until_healthy(url: Text, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with aiohttp.ClientSession() as session:
+        while time.monotonic() < deadline:
+            try:
+                async with session.get(url) as response:
+                    if response.status == 200:
+                        return
+            except aiohttp.ClientError:
+                pass
+            await asyncio.sleep(0.25)
+    raise RuntimeError(f"Action server tidak sehat setelah {timeout:.0f}s: {url}")
+
+
+async def _run(args: argparse.Namespace) -> None:
+    runner = web.AppRunner(create_stub_app(stub_config_from_args(args)))
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", args.stub_port).start()
+
+    env = dict(os.environ, API_ROOT_URL=f"http://127.0.0.1:{args.stub_port}")
+    action_server = subprocess.Popen(
+        [sys.executable, "-m", "rasa_sdk", "--actions", "actions", "--port", str(args.action_port)],
+        cwd=PROJECT_ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL if not args.verbose else None,
+        stderr=subprocess.DEVNULL if not args.verbose else None,
+    )
+    try:
+        base_url = f"http://127.0.0.1:{args.action_port}"
+        await _wait_until_healthy(f"{base_url}/ready")
+        report = await run_load(
+            f"{base_url}/webhook",
+            concurrency=args.concurrency,
+            duration=None if args.requests else args.duration,
+            total_requests=args.requests,
+            users=args.users,
+            history_events=args.history_events,
+        )
+        async with aiohttp.ClientSession() as session:
+            async with session.get(f"http://127.0.0.1:{args.stub_port}/__stats") as response:
+                upstream_calls = await response.json()
+
+        print(report.format())
+        print("\nRequest ke backend stub per endpoint:")
+        for path, count in sorted(upstream_calls.items()):
+            print(f"  {path:<32}{count:>7}")
+        if args.json_output:
+            summary = report.summary()
+            summary["upstream_calls"] = upstream_calls
+            with open(args.json_output, "w", encoding="utf-8") as f:
+                json.dump(summary, f, indent=2)
+    finally:
+        action_server.terminate()
+        try:
+            action_server.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            action_server.kill()
+        await runner.cleanup()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--stub-port", type=int, default=8099)
+    parser.add_argument("--action-port", type=int, default=5055)
+    parser.add_argument("--verbose", action="store_true",
+                        help="Tampilkan log action server.")
+    add_stub_arguments(parser)
+    add_load_arguments(parser)
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
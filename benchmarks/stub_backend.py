@@ -0,0 +1,207 @@
+"""Stub lokal backend toko untuk benchmark action server.
+
+Menyediakan `/product`, `/product/{id}`, `/product/recommendations`, `/shop`
+dan `/order/all` dengan latensi, tingkat error dan ukuran payload yang bisa
+diatur. Jalankan sendiri dengan:
+
+    python -m benchmarks.stub_backend --port 8099 --catalog-size 500 --latency-ms 40
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, List, Text
+
+from aiohttp import web
+
+_DISHES = ["Ayam Bakar", "Ayam Goreng", "Ayam Penyet", "Ayam Geprek", "Nasi Uduk",
+           "Nasi Liwet", "Sate Ayam", "Es Teh", "Es Jeruk", "Tahu Tempe"]
+_VARIANTS = ["Madu", "Pedas", "Kecap", "Taliwang", "Rica-Rica", "Kremes",
+             "Sambal Matah", "Original", "Jumbo", "Spesial"]
+_CITIES = ["Serpong", "Depok", "Bekasi", "Bogor", "Tangerang", "Cibubur",
+           "Kemang", "Cempaka Putih", "Bintaro", "Cinere"]
+_ORDER_STATUSES = ["PENDING_CONFIRMATION", "AWAITING_PAYMENT", "PROCESSING",
+                   "READY_FOR_PICKUP", "COMPLETED", "CANCELLED"]
+_PAYMENT_STATUSES = [("paid", "online_gateway"), ("pay_on_pickup", "pay_at_store"),
+                     ("awaiting_gateway_interaction", "online_gateway"), ("expired", "online_gateway")]
+
+
+@dataclass
+class StubConfig:
+    catalog_size: int = 200
+    shop_count: int = 20
+    orders_per_user: int = 50
+    recommendation_count: int = 5
+    latency_ms: float = 20.0
+    jitter_ms: float = 10.0
+    error_rate: float = 0.0
+    seed: int = 42
+
+
+def _make_products(config: StubConfig, rng: random.Random) -> List[Dict[Text, Any]]:
+    products = []
+    for i in range(config.catalog_size):
+        dish = _DISHES[i % len(_DISHES)]
+        variant = _VARIANTS[(i // len(_DISHES)) % len(_VARIANTS)]
+        suffix = i // (len(_DISHES) * len(_VARIANTS))
+        name = f"{dish} {variant}" + (f" {suffix + 1}" if suffix else "")
+        products.append({
+            "_id": f"{i:024x}",
+            "name": name,
+            "price": rng.randrange(10, 80) * 1000,
+            "description": f"{name} khas Nusantara dengan bumbu pilihan.",
+            "stock": rng.randrange(0, 100),
+            "category": "Minuman" if dish.startswith("Es") else "Makanan",
+            "productImageURL": f"https://img.example.com/product/{i}.jpg",
+            "averageRating": round(rng.uniform(3.0, 5.0), 1),
+            "ratingCount": rng.randrange(0, 200),
+        })
+    return products
+
+
+def _make_shops(config: StubConfig) -> List[Dict[Text, Any]]:
+    return [{
+        "_id": f"{i:024x}",
+        "shopName": f"Ayam Bakar Nusantara Cabang {_CITIES[i % len(_CITIES)]}"
+                    + (f" {i // len(_CITIES) + 1}" if i >= len(_CITIES) else ""),
+        "shopAddress": f"Jl. Raya {_CITIES[i % len(_CITIES)]} No. {i + 1}",
+        "description": "Cabang resmi Ayam Bakar Nusantara.",
+        "bannerImageURL": f"https://img.example.com/shop/{i}.jpg",
+        "ownerName": f"Pemilik {i + 1}",
+    } for i in range(config.shop_count)]
+
+
+def _make_orders(config: StubConfig, products: List[Dict[Text, Any]], rng: random.Random) -> List[Dict[Text, Any]]:
+    orders = []
+    for i in range(config.orders_per_user):
+        items = rng.sample(products, k=min(len(products), rng.randrange(1, 5)))
+        payment_status, method = rng.choice(_PAYMENT_STATUSES)
+        orders.append({
+            "orderId": f"ORD-{i:06d}",
+            "orderStatus": rng.choice(_ORDER_STATUSES),
+            "totalPrice": sum(item["price"] for item in items),
+            "items": [{"productId": item["_id"], "name": item["name"], "quantity": 1,
+                       "price": item["price"]} for item in items],
+            "createdAt": f"2025-05-{(i % 28) + 1:02d}T10:00:00.000Z",
+            "shopRingkas": {"shopName": "Ayam Bakar Nusantara Cabang Serpong"},
+            "paymentDetails": {"method": method, "status": payment_status,
+                               "confirmedAt": "2025-05-01T10:05:00.000Z"},
+        })
+    return orders
+
+
+def create_stub_app(config: StubConfig) -> web.Application:
+    rng = random.Random(config.seed)
+    products = _make_products(config, rng)
+    products_by_id = {product["_id"]: product for product in products}
+    recommendations = sorted(
+        products, key=lambda p: (p["averageRating"], p["ratingCount"]), reverse=True
+    )[:config.recommendation_count]
+    shops = _make_shops(config)
+    orders = _make_orders(config, products, rng)
+    stats: Counter = Counter()
+
+    def catalog_response(request: web.Request, payload: Dict[Text, Any]) -> web.Response:
+        # Katalog stub tidak pernah berubah, jadi ETag-nya stabil dan
+        # revalidasi action server selalu berakhir 304.
+        body = json.dumps(payload).encode("utf-8")
+        etag = '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+        if request.headers.get("If-None-Match") == etag:
+            stats[f"{request.match_info.route.resource.canonical} (304)"] += 1
+            return web.Response(status=304, headers={"ETag": etag})
+        response = web.Response(body=body, content_type="application/json", headers={"ETag": etag})
+        response.enable_compression()
+        return response
+
+    @web.middleware
+    async def simulate_backend(request: web.Request, handler):
+        if request.path.startswith("/__"):
+            return await handler(request)
+        resource = request.match_info.route.resource
+        stats[resource.canonical if resource is not None else request.path] += 1
+        delay = config.latency_ms + rng.uniform(-config.jitter_ms, config.jitter_ms)
+        await asyncio.sleep(max(delay, 0.0) / 1000)
+        if rng.random() < config.error_rate:
+            return web.json_response({"success": False, "message": "Stub error"}, status=503)
+        return await handler(request)
+
+    async def list_products(request: web.Request) -> web.Response:
+        term = request.query.get("searchByName", "").lower()
+        if not term:
+            return catalog_response(request, {"success": True, "data": {"products": products}})
+        found = [p for p in products if term in p["name"].lower()]
+        return web.json_response({"success": True, "data": {"products": found}})
+
+    async def product_recommendations(request: web.Request) -> web.Response:
+        return catalog_response(request, {"success": True, "data": {"recommendations": recommendations}})
+
+    async def product_detail(request: web.Request) -> web.Response:
+        product = products_by_id.get(request.match_info["product_id"])
+        if product is None:
+            return web.json_response({"success": False, "message": "Produk tidak ditemukan"}, status=404)
+        return web.json_response({"success": True, "data": product})
+
+    async def list_shops(request: web.Request) -> web.Response:
+        term = request.query.get("searchByShopName", "").lower()
+        if not term:
+            return catalog_response(request, {"success": True, "data": {"shops": shops}})
+        found = [s for s in shops if term in s["shopName"].lower()]
+        return web.json_response({"success": True, "data": {"shops": found}})
+
+    async def list_orders(request: web.Request) -> web.Response:
+        if not request.headers.get("Authorization", "").startswith("Bearer "):
+            return web.json_response({"success": False, "message": "Token tidak disertakan"}, status=401)
+        return web.json_response({"success": True, "message": "Berhasil", "data": orders})
+
+    async def stub_stats(_request: web.Request) -> web.Response:
+        return web.json_response(dict(stats))
+
+    app = web.Application(middlewares=[simulate_backend])
+    app.router.add_get("/product", list_products)
+    app.router.add_get("/product/recommendations", product_recommendations)
+    app.router.add_get("/product/{product_id}", product_detail)
+    app.router.add_get("/shop", list_shops)
+    app.router.add_get("/order/all", list_orders)
+    app.router.add_get("/__stats", stub_stats)
+    app["products"] = products
+    app["shops"] = shops
+    return app
+
+
+def add_stub_arguments(parser: argparse.ArgumentParser) -> None:
+    defaults = StubConfig()
+    parser.add_argument("--catalog-size", type=int, default=defaults.catalog_size)
+    parser.add_argument("--shop-count", type=int, default=defaults.shop_count)
+    parser.add_argument("--orders-per-user", type=int, default=defaults.orders_per_user)
+    parser.add_argument("--latency-ms", type=float, default=defaults.latency_ms)
+    parser.add_argument("--jitter-ms", type=float, default=defaults.jitter_ms)
+    parser.add_argument("--error-rate", type=float, default=defaults.error_rate)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+
+
+def stub_config_from_args(args: argparse.Namespace) -> StubConfig:
+    return StubConfig(
+        catalog_size=args.catalog_size,
+        shop_count=args.shop_count,
+        orders_per_user=args.orders_per_user,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    add_stub_arguments(parser)
+    args = parser.parse_args()
+    web.run_app(create_stub_app(stub_config_from_args(args)), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
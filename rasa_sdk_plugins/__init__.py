@@ -0,0 +1,88 @@
+import re
+import sys
+import time
+import zlib
+import pluggy
+from typing import Optional, Text
+from sanic import Sanic, response
+from sanic.request import Request
+from sanic.response import HTTPResponse
+
+hookimpl = pluggy.HookimplMarker("rasa_sdk")
+
+_NEXT_ACTION = re.compile(rb'"next_action"\s*:\s*"([^"]+)"')
+
+
+def init_hooks(manager: pluggy.PluginManager) -> None:
+    """Dipanggil oleh rasa_sdk saat action server dibuat."""
+    manager.register(sys.modules[__name__])
+
+
+def _action_name(request: Request) -> Text:
+    body = request.body or b""
+    if request.headers.get("Content-Encoding") == "deflate":
+        try:
+            body = zlib.decompress(body)
+        except zlib.error:
+            return "unknown"
+    match = _NEXT_ACTION.search(body)
+    return match.group(1).decode("utf-8", "replace") if match else "unknown"
+
+
+@hookimpl
+def attach_sanic_app_extensions(app: Sanic) -> None:
+    from actions.action_http_client import close_http_client, start_http_client
+    from actions.action_warmup import is_ready, start_catalog_refresh, stop_catalog_refresh
+    from actions.action_metrics import (
+        ACTION_LATENCY,
+        ACTION_REQUESTS,
+        ACTIONS_IN_FLIGHT,
+        render_prometheus,
+    )
+
+    async def _start_http_client(_app: Sanic) -> None:
+        await start_http_client()
+
+    async def _start_catalog_refresh(_app: Sanic) -> None:
+        start_catalog_refresh()
+
+    async def _close_http_client(_app: Sanic) -> None:
+        await stop_catalog_refresh()
+        await close_http_client()
+
+    async def _start_action_timer(request: Request) -> None:
+        if request.path != "/webhook":
+            return
+        request.ctx.action_name = _action_name(request)
+        request.ctx.action_started = time.perf_counter()
+        ACTIONS_IN_FLIGHT.inc(request.ctx.action_name)
+
+    async def _observe_action(request: Request, resp: HTTPResponse) -> None:
+        action_name: Optional[Text] = getattr(
+            request.ctx, "action_name", None)
+        if action_name is None:
+            return
+        ACTIONS_IN_FLIGHT.dec(action_name)
+        ACTION_LATENCY.observe(
+            time.perf_counter() - request.ctx.action_started, action_name)
+        ACTION_REQUESTS.inc(action_name, str(resp.status))
+        request.ctx.action_name = None
+
+    async def metrics(_request: Request) -> HTTPResponse:
+        return response.text(
+            render_prometheus(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+    async def ready(_request: Request) -> HTTPResponse:
+        # /health dari rasa_sdk hanya menandakan proses hidup; /ready baru
+        # 200 setelah katalog selesai di-warm-up.
+        if is_ready():
+            return response.json({"status": "ready"})
+        return response.json({"status": "warming_up"}, status=503)
+
+    app.register_listener(_start_http_client, "before_server_start")
+    app.register_listener(_start_catalog_refresh, "after_server_start")
+    app.register_listener(_close_http_client, "after_server_stop")
+    app.register_middleware(_start_action_timer, "request")
+    app.register_middleware(_observe_action, "response")
+    app.add_route(metrics, "/metrics", methods=["GET"])
+    app.add_route(ready, "/ready", methods=["GET"])
@@ -0,0 +1,46 @@
+import asyncio
+
+import pytest
+
+from actions import action_resilience
+from actions.action_resilience import Bulkhead, BulkheadFullError, get_bulkhead
+
+
+async def hold(bulkhead, release):
+    async with bulkhead.slot():
+        await release.wait()
+
+
+async def contend(route, waiters=2):
+    """Isi semua slot route lalu biarkan request lain menunggu di antrean."""
+    bulkhead = get_bulkhead(route)
+    release = asyncio.Event()
+    tasks = [asyncio.create_task(hold(bulkhead, release)) for _ in range(waiters + 1)]
+    await asyncio.sleep(0)
+    in_flight, queued = bulkhead.in_flight, bulkhead.queued
+    release.set()
+    await asyncio.gather(*tasks)
+    return in_flight, queued
+
+
+def test_full_queue_rejects_without_waiting():
+    async def run():
+        bulkhead = Bulkhead("test", max_concurrent=1, max_queue=1)
+        release = asyncio.Event()
+        tasks = [asyncio.create_task(hold(bulkhead, release)) for _ in range(2)]
+        await asyncio.sleep(0)
+        with pytest.raises(BulkheadFullError):
+            async with bulkhead.slot():
+                pass
+        release.set()
+        await asyncio.gather(*tasks)
+
+    asyncio.run(run())
+
+
+def test_bulkheads_work_across_event_loops(monkeypatch):
+    monkeypatch.setattr(action_resilience, "HTTP_ENDPOINT_BULKHEADS", {"/product": (1, 5)})
+    monkeypatch.setattr(action_resilience, "_bulkheads", {})
+
+    assert asyncio.run(contend("/product")) == (1, 2)
+    assert asyncio.run(contend("/product")) == (1, 2)
@@ -0,0 +1,44 @@
+import pytest
+
+pytest.importorskip("rasa")
+
+from rasa.dialogue_understanding.generator import CompactLLMCommandGenerator  # noqa: E402
+
+from addons.cached_llm_components import CachingCompactLLMCommandGenerator  # noqa: E402
+from addons.flow_embeddings import CachedEmbeddings, HashingEmbedder  # noqa: E402
+
+
+class FakeVectorStore:
+    def __init__(self, embedding_function):
+        self.embedding_function = embedding_function
+
+
+class FakeFlowRetrieval:
+    """Seperti hasil `FlowRetrieval.load`: embedder dibuat baru, tanpa pembungkus."""
+
+    def __init__(self, embedder):
+        self.embeddings = embedder
+        self.vector_store = FakeVectorStore(embedder)
+
+
+def test_loaded_generator_serves_repeated_queries_from_cache(monkeypatch, tmp_path):
+    embedder = HashingEmbedder(dim=16)
+
+    def load(cls, config, model_storage, resource, execution_context, **kwargs):
+        generator = cls.__new__(cls)
+        generator.config = config
+        generator.flow_retrieval = FakeFlowRetrieval(embedder)
+        return generator
+
+    monkeypatch.setattr(CompactLLMCommandGenerator, "load", classmethod(load))
+    config = {"flow_embeddings": {"path": str(tmp_path / "flows.vec"), "query_cache_size": 8}}
+
+    generator = CachingCompactLLMCommandGenerator.load(config, None, None, None)
+
+    embedding_function = generator.flow_retrieval.vector_store.embedding_function
+    assert isinstance(embedding_function, CachedEmbeddings)
+    assert generator.flow_retrieval.embeddings is embedding_function
+    first = embedding_function.embed_query("Cek status pesanan")
+    assert embedding_function.embed_query("Cek status pesanan") == first
+    assert embedder.calls == 1
+    assert generator.flow_embeddings.query_hits == 1
@@ -0,0 +1,112 @@
+import asyncio
+import time
+import types
+
+import pytest
+
+from actions import action_http_client, action_resilience
+from actions.action_resilience import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    UpstreamUnavailableError,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    # Hanya jam milik action_resilience yang dipalsukan; event loop asyncio
+    # tetap memakai time.monotonic asli.
+    clock = FakeClock()
+    monkeypatch.setattr(action_resilience, "time",
+                        types.SimpleNamespace(monotonic=clock, perf_counter=time.perf_counter))
+    return clock
+
+
+def open_breaker(clock, name="test"):
+    breaker = CircuitBreaker(name, failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    clock.now += 30
+    return breaker
+
+
+def test_only_one_probe_is_allowed_while_half_open(clock):
+    breaker = open_breaker(clock)
+
+    assert breaker.allow_request()
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow_request()
+
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.allow_request()
+
+
+def test_lost_probe_claim_expires_after_reset_timeout(clock):
+    breaker = open_breaker(clock)
+    assert breaker.allow_request()
+
+    clock.now += 29
+    assert not breaker.allow_request()
+    clock.now += 1
+    assert breaker.allow_request()
+
+
+def test_cancelled_probe_releases_the_circuit(clock, monkeypatch):
+    breaker = open_breaker(clock, "/cancelled-probe")
+    monkeypatch.setitem(action_resilience._breakers, "/cancelled-probe", breaker)
+
+    async def cancelled(*args, **kwargs):
+        raise asyncio.CancelledError()
+
+    monkeypatch.setattr(action_http_client, "_read_json", cancelled)
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(action_http_client._get_json("http://upstream/cancelled-probe", None, None))
+
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow_request()
+
+
+def test_open_circuit_fails_without_waiting_for_a_bulkhead_slot(monkeypatch):
+    breaker = CircuitBreaker("/busy", failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    monkeypatch.setitem(action_resilience._breakers, "/busy", breaker)
+    monkeypatch.setattr(action_resilience, "HTTP_ENDPOINT_BULKHEADS", {"/busy": (1, 5)})
+
+    async def run():
+        bulkhead = action_resilience.get_bulkhead("/busy")
+        release = asyncio.Event()
+
+        async def hold():
+            async with bulkhead.slot():
+                await release.wait()
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        try:
+            with pytest.raises(UpstreamUnavailableError, match="terbuka"):
+                await asyncio.wait_for(
+                    action_http_client._get_json("http://upstream/busy", None, None), 0.5)
+            return bulkhead.queued
+        finally:
+            release.set()
+            await holder
+
+    assert asyncio.run(run()) == 0
+
+
+def test_connect_timeout_does_not_cover_waiting_for_the_pool():
+    timeout = action_http_client._timeout_for("/product")
+    assert timeout.connect is None
+    assert timeout.sock_connect == action_http_client.HTTP_CONNECT_TIMEOUT
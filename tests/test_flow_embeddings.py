@@ -0,0 +1,146 @@
+import pytest
+
+from addons.flow_embeddings import (
+    CachedEmbeddings,
+    FlowEmbeddingStore,
+    HashingEmbedder,
+    embedder_identity,
+)
+
+DESCRIPTIONS = [
+    "Flow ini digunakan ketika pengguna mencari produk.",
+    "Flow ini digunakan ketika pengguna mengecek status pesanan.",
+]
+
+
+@pytest.fixture
+def store_path(tmp_path):
+    return str(tmp_path / "flows.vec")
+
+
+def test_vectors_survive_reopening_the_file(store_path):
+    embedder = HashingEmbedder(dim=16)
+    vectors = embedder.embed_documents(DESCRIPTIONS)
+    FlowEmbeddingStore(store_path).add(DESCRIPTIONS, vectors)
+
+    reopened = FlowEmbeddingStore(store_path)
+    assert len(reopened) == 2
+    assert reopened.dim == 16
+    for text, vector in zip(DESCRIPTIONS, vectors):
+        assert reopened.get(text) == pytest.approx(vector)
+    assert reopened.get("deskripsi lain") is None
+
+
+def test_only_new_descriptions_are_embedded(store_path):
+    CachedEmbeddings(HashingEmbedder(dim=16), FlowEmbeddingStore(store_path)).embed_documents(
+        DESCRIPTIONS[:1])
+
+    embedder = HashingEmbedder(dim=16)
+    embeddings = CachedEmbeddings(embedder, FlowEmbeddingStore(store_path))
+    embeddings.embed_documents(DESCRIPTIONS)
+
+    assert embedder.calls == 1
+    assert (embeddings.document_hits, embeddings.document_misses) == (1, 1)
+    assert len(FlowEmbeddingStore(store_path)) == 2
+
+
+def test_dimension_change_rewrites_the_file(store_path):
+    store = FlowEmbeddingStore(store_path)
+    store.add(DESCRIPTIONS, HashingEmbedder(dim=16).embed_documents(DESCRIPTIONS))
+
+    vector = HashingEmbedder(dim=8).embed_documents(DESCRIPTIONS[:1])
+    store.add(DESCRIPTIONS[:1], vector)
+
+    reopened = FlowEmbeddingStore(store_path)
+    assert reopened.dim == 8
+    assert len(reopened) == 1
+    assert reopened.get(DESCRIPTIONS[0]) == pytest.approx(vector[0])
+
+
+@pytest.mark.parametrize("content", [b"", b"FEV", b"XXXX" + b"\0" * 8, b"FEV1" + b"\1\0\0\0" * 2])
+def test_invalid_files_are_ignored(store_path, content):
+    with open(store_path, "wb") as f:
+        f.write(content)
+
+    store = FlowEmbeddingStore(store_path)
+    assert len(store) == 0
+    assert store.get(DESCRIPTIONS[0]) is None
+
+    store.add(DESCRIPTIONS, HashingEmbedder(dim=16).embed_documents(DESCRIPTIONS))
+    assert len(FlowEmbeddingStore(store_path)) == 2
+
+
+class ModelEmbedder(HashingEmbedder):
+    """Seperti client embedding sungguhan: identitas model ada di atribut `model`."""
+
+    def __init__(self, model, dim=16):
+        super().__init__(dim)
+        self.model = model
+
+
+def cached_embeddings(embedder, store_path):
+    return CachedEmbeddings(embedder, FlowEmbeddingStore(store_path, embedder_identity(embedder)))
+
+
+def test_changing_the_embedding_model_discards_stored_vectors(store_path):
+    cached_embeddings(ModelEmbedder("text-embedding-004"), store_path).embed_documents(DESCRIPTIONS)
+
+    same_model = ModelEmbedder("text-embedding-004")
+    cached_embeddings(same_model, store_path).embed_documents(DESCRIPTIONS)
+    assert same_model.calls == 0
+
+    new_model = ModelEmbedder("text-embedding-005")
+    embeddings = cached_embeddings(new_model, store_path)
+    assert len(embeddings.store) == 0
+    embeddings.embed_documents(DESCRIPTIONS)
+    assert new_model.calls == 2
+    assert len(FlowEmbeddingStore(store_path, embedder_identity(new_model))) == 2
+
+
+def test_dimension_change_without_new_identity_re_embeds_everything(store_path):
+    store = FlowEmbeddingStore(store_path)
+    store.add(DESCRIPTIONS[:1], HashingEmbedder(dim=16).embed_documents(DESCRIPTIONS[:1]))
+
+    embeddings = CachedEmbeddings(HashingEmbedder(dim=8), store)
+    vectors = embeddings.embed_documents(DESCRIPTIONS)
+
+    assert [len(vector) for vector in vectors] == [8, 8]
+    assert store.dim == 8
+
+
+def test_repeated_queries_are_served_from_cache(store_path):
+    embedder = HashingEmbedder(dim=16)
+    embeddings = CachedEmbeddings(embedder, FlowEmbeddingStore(store_path))
+
+    first = embeddings.embed_query("Cek status pesanan")
+    assert embeddings.embed_query("Cek status pesanan") == first
+    assert embeddings("Cek status pesanan") == first
+    assert embedder.calls == 1
+    assert (embeddings.query_hits, embeddings.query_misses) == (2, 1)
+
+
+def test_emoji_and_non_latin_queries_do_not_share_an_entry(store_path):
+    embedder = HashingEmbedder(dim=16)
+    embeddings = CachedEmbeddings(embedder, FlowEmbeddingStore(store_path))
+
+    for text in ["👍", "🙏", "こんにちは", "👍"]:
+        embeddings.embed_query(text)
+
+    assert embedder.calls == 3
+    assert embeddings.query_hits == 1
+
+
+def test_least_recently_used_query_is_evicted(store_path):
+    embedder = HashingEmbedder(dim=16)
+    embeddings = CachedEmbeddings(embedder, FlowEmbeddingStore(store_path), query_cache_size=2)
+
+    embeddings.embed_query("halo")
+    embeddings.embed_query("menu")
+    embeddings.embed_query("halo")
+    embeddings.embed_query("promo")
+    assert embedder.calls == 3
+
+    embeddings.embed_query("halo")
+    assert embedder.calls == 3
+    embeddings.embed_query("menu")
+    assert embedder.calls == 4
@@ -0,0 +1,39 @@
+import asyncio
+import warnings
+
+import pytest
+
+from actions import action_http_client
+
+
+@pytest.fixture(autouse=True)
+def fresh_session(monkeypatch):
+    monkeypatch.setattr(action_http_client, "_session", None)
+    monkeypatch.setattr(action_http_client, "_session_loop", None)
+    yield
+    asyncio.run(action_http_client.close_http_client())
+
+
+async def open_session():
+    session = action_http_client.get_session()
+    # Beri kesempatan penutupan session lama di background untuk berjalan.
+    await asyncio.sleep(0)
+    return session
+
+
+def test_session_is_reused_within_a_loop():
+    async def run():
+        return action_http_client.get_session() is action_http_client.get_session()
+
+    assert asyncio.run(run())
+
+
+def test_session_from_previous_loop_is_closed_when_replaced():
+    first = asyncio.run(open_session())
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        second = asyncio.run(open_session())
+
+    assert second is not first
+    assert first.closed
+    assert not second.closed
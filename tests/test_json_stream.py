@@ -0,0 +1,37 @@
+import asyncio
+
+import pytest
+
+from actions.action_json_stream import read_bounded_json
+
+
+def read(body, limit, chunk_size=7):
+    async def chunks():
+        for i in range(0, len(body), chunk_size):
+            yield body[i:i + chunk_size]
+
+    return asyncio.run(read_bounded_json(chunks(), "data", limit))
+
+
+def test_reading_stops_at_limit():
+    body = b'{"data": [{"id": 1}, {"id": 2}, {"id": 3}], "success": true}'
+    assert read(body, 2) == ({"data": [{"id": 1}, {"id": 2}]}, True)
+
+
+def test_complete_body_is_not_truncated():
+    body = b'{"success": false, "data": [{"id": 1}], "message": "x"}'
+    assert read(body, 5) == ({"success": False, "data": [{"id": 1}], "message": "x"}, False)
+
+
+@pytest.mark.parametrize("body, expected", [
+    (b"{}", {}),
+    (b'{"message": "Unauthorized"}', {"message": "Unauthorized"}),
+    (b'{"data": null}', {"data": None}),
+])
+def test_body_without_array_is_not_truncated(body, expected):
+    assert read(body, 1) == (expected, False)
+
+
+def test_unterminated_body_is_rejected():
+    with pytest.raises(ValueError):
+        read(b'{"data": [{"id": 1}', 5)
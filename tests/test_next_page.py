@@ -0,0 +1,58 @@
+import asyncio
+
+import pytest
+from rasa_sdk import Tracker
+from rasa_sdk.executor import CollectingDispatcher
+
+from actions import action_listing, action_show_next_page
+from actions.action_constants import LISTING_PAGE_SIZE
+from actions.action_http_client import ApiResponse
+from actions.action_listing import LISTING_CURSOR_SLOT, encode_cursor, snapshot_id_of
+from actions.action_models import Product
+
+
+def make_products(names):
+    return [Product(f"p{i}", name, 10000, "", 5, "Ayam", None, 4.0, 1)
+            for i, name in enumerate(names)]
+
+
+@pytest.fixture(autouse=True)
+def empty_snapshots(monkeypatch):
+    # Seolah cursor dibuat oleh worker lain: tidak ada snapshot di worker ini.
+    monkeypatch.setattr(action_listing, "_snapshots", type(action_listing._snapshots)())
+    monkeypatch.setattr(action_listing, "_current", {})
+
+
+def serve_catalog(monkeypatch, products):
+    async def get_products():
+        return ApiResponse(200, {"success": True, "data": {"products": products}})
+
+    monkeypatch.setattr(action_show_next_page, "get_products", get_products)
+
+
+def run_next_page(cursor):
+    tracker = Tracker("user", {LISTING_CURSOR_SLOT: cursor}, {}, [], False, None, {}, "action_listen")
+    dispatcher = CollectingDispatcher()
+    events = asyncio.run(action_show_next_page.ActionShowNextPage().run(dispatcher, tracker, {}))
+    return dispatcher.messages[0]["text"], events
+
+
+def test_unchanged_catalog_continues_from_cursor(monkeypatch):
+    products = make_products([f"Ayam {i:02d}" for i in range(LISTING_PAGE_SIZE + 2)])
+    serve_catalog(monkeypatch, products)
+
+    text, _ = run_next_page(encode_cursor("products", snapshot_id_of(products), LISTING_PAGE_SIZE))
+
+    assert text.startswith("Berikut produk berikutnya:")
+    assert "Ayam 00" not in text
+
+
+def test_changed_catalog_restarts_from_first_page(monkeypatch):
+    shown = make_products([f"Ayam {i:02d}" for i in range(LISTING_PAGE_SIZE + 2)])
+    serve_catalog(monkeypatch, make_products(["Ayam Baru"]) + shown)
+
+    text, events = run_next_page(encode_cursor("products", snapshot_id_of(shown), LISTING_PAGE_SIZE))
+
+    assert text.startswith("Daftar produk sudah berubah, berikut dari awal:")
+    assert "Ayam Baru" in text
+    assert events[0]["value"] is not None
@@ -0,0 +1,66 @@
+from rasa_sdk import Tracker
+
+from actions.action_show_product_detail import _product_references
+
+RECOMMENDED = ["p1", "p2", "p3"]
+
+
+def make_tracker(text, entities=(), previous_actions=("action_recommend_products",)):
+    events = [{"event": "user", "text": "ada rekomendasi?"}]
+    events += [{"event": "action", "name": name} for name in previous_actions]
+    events += [{"event": "action", "name": "action_listen"}, {"event": "user", "text": text}]
+    latest_message = {
+        "text": text,
+        "entities": [{"entity": "product_name", "value": value} for value in entities],
+    }
+    return Tracker("user", {"recommended_product_ids": RECOMMENDED}, latest_message,
+                   events, False, None, {}, "action_listen")
+
+
+def test_ordinals_resolve_right_after_recommendation():
+    tracker = make_tracker("yang pertama dan ketiga")
+    assert _product_references(tracker) == [("rekomendasi ke-1", "p1"), ("rekomendasi ke-3", "p3")]
+
+
+def test_ordinals_resolve_later_when_no_product_is_named():
+    tracker = make_tracker("detail yang kedua", previous_actions=("utter_greet",))
+    assert _product_references(tracker) == [("rekomendasi ke-2", "p2")]
+
+
+def test_named_product_later_in_conversation_ignores_ordinals():
+    tracker = make_tracker("detail Ayam Bakar Madu yang kedua kali saya pesan",
+                           entities=["Ayam Bakar Madu"], previous_actions=("utter_greet",))
+    assert _product_references(tracker) == [("Ayam Bakar Madu", None)]
+
+
+def test_named_product_and_ordinal_after_recommendation():
+    tracker = make_tracker("yang pertama dan Ayam Bakar Madu", entities=["Ayam Bakar Madu"],
+                           previous_actions=("action_recommend_products",
+                                             "utter_ask_after_recommendations"))
+    assert _product_references(tracker) == [("rekomendasi ke-1", "p1"), ("Ayam Bakar Madu", None)]
+
+
+def test_answer_to_which_recommendation_prompt_keeps_ordinal_and_name():
+    text = "yang nomor 2 sama Ayam Bakar Madu"
+    events = [
+        {"event": "user", "text": "kasih rekomendasi produk dong"},
+        {"event": "action", "name": "utter_give_recommendations"},
+        {"event": "action", "name": "action_recommend_products"},
+        {"event": "action", "name": "utter_ask_after_recommendations"},
+        {"event": "action", "name": "action_listen"},
+        {"event": "user", "text": "iya"},
+        {"event": "action", "name": "utter_ask_which_recommendation_detail"},
+        {"event": "action", "name": "action_listen"},
+        {"event": "user", "text": text},
+    ]
+    latest_message = {"text": text, "entities": [{"entity": "product_name", "value": "Ayam Bakar Madu"}]}
+    tracker = Tracker("user", {"recommended_product_ids": RECOMMENDED}, latest_message,
+                      events, False, None, {}, "action_listen")
+
+    assert _product_references(tracker) == [("rekomendasi ke-2", "p2"), ("Ayam Bakar Madu", None)]
+
+
+def test_ordinals_stay_aligned_when_a_recommendation_has_no_id():
+    tracker = make_tracker("yang kedua dan ketiga")
+    tracker.slots["recommended_product_ids"] = ["p1", None, "p3"]
+    assert _product_references(tracker) == [("rekomendasi ke-3", "p3")]
@@ -0,0 +1,175 @@
+import asyncio
+
+import pytest
+
+from addons.response_cache import (
+    BoundedTTLCache,
+    cacheable_commands,
+    normalize_message,
+    response_cache_key,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeLLM:
+    """LLM palsu: menghitung panggilan dan bisa ditahan agar panggilan saling tumpang tindih."""
+
+    def __init__(self, result=("start flow greet_flow",), delay=0.0):
+        self.result = list(result)
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return list(self.result)
+
+
+class StartFlowCommand:
+    pass
+
+
+class ErrorCommand:
+    pass
+
+
+class CannotHandleCommand:
+    pass
+
+
+STATE = {"active_flow": None, "slots": {}, "last_bot_turn": "utter_greet"}
+
+
+def test_normalize_message_ignores_case_punctuation_and_spacing():
+    assert normalize_message("Halo!!") == "halo"
+    assert normalize_message("  Cek   pesanan saya? ") == "cek pesanan saya"
+    assert normalize_message(None) == ""
+
+
+def test_key_is_shared_by_message_variants():
+    assert response_cache_key("Halo!", STATE) == response_cache_key("halo", STATE)
+    assert response_cache_key("halo", STATE) != response_cache_key("dadah", STATE)
+
+
+@pytest.mark.parametrize("changed", [
+    {"active_flow": "product_search_flow"},
+    {"slots": {"product_name_slot": "Ayam Bakar Madu"}},
+    {"last_bot_turn": "utter_ask_product_name_slot"},
+])
+def test_key_depends_on_dialogue_state(changed):
+    assert response_cache_key("iya", STATE) != response_cache_key("iya", {**STATE, **changed})
+
+
+def test_key_ignores_slot_order():
+    first = {**STATE, "slots": {"a": 1, "b": 2}}
+    second = {**STATE, "slots": {"b": 2, "a": 1}}
+    assert response_cache_key("iya", first) == response_cache_key("iya", second)
+
+
+def test_repeated_message_is_served_from_cache():
+    cache = BoundedTTLCache(max_size=10, ttl=60)
+    llm = FakeLLM()
+
+    async def run():
+        return [await cache.get_or_compute("k", llm) for _ in range(3)]
+
+    results = asyncio.run(run())
+    assert llm.calls == 1
+    assert results == [["start flow greet_flow"]] * 3
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_cached_values_are_copies():
+    cache = BoundedTTLCache(max_size=10, ttl=60)
+    cache.set("k", ["a"])
+    cache.get("k").append("b")
+    assert cache.get("k") == ["a"]
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = BoundedTTLCache(max_size=10, ttl=60, clock=clock)
+    llm = FakeLLM()
+
+    asyncio.run(cache.get_or_compute("k", llm))
+    clock.now = 59.9
+    asyncio.run(cache.get_or_compute("k", llm))
+    assert llm.calls == 1
+
+    clock.now = 60.0
+    asyncio.run(cache.get_or_compute("k", llm))
+    assert llm.calls == 2
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = BoundedTTLCache(max_size=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_concurrent_misses_share_one_llm_call():
+    cache = BoundedTTLCache(max_size=10, ttl=60)
+    llm = FakeLLM(delay=0.01)
+
+    async def run():
+        return await asyncio.gather(*(cache.get_or_compute("k", llm) for _ in range(5)))
+
+    results = asyncio.run(run())
+    assert llm.calls == 1
+    assert all(result == ["start flow greet_flow"] for result in results)
+
+
+def test_failed_compute_is_not_cached():
+    cache = BoundedTTLCache(max_size=10, ttl=60)
+
+    async def failing():
+        raise RuntimeError("LLM tidak tersedia")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(cache.get_or_compute("k", failing))
+    assert len(cache) == 0
+
+
+@pytest.mark.parametrize("commands", [
+    [],
+    [ErrorCommand()],
+    [CannotHandleCommand()],
+    [StartFlowCommand(), ErrorCommand()],
+])
+def test_llm_failures_are_not_cached(commands):
+    cache = BoundedTTLCache(max_size=10, ttl=60)
+    llm = FakeLLM(result=commands)
+
+    async def run():
+        for _ in range(2):
+            await cache.get_or_compute("k", llm, should_cache=cacheable_commands)
+
+    asyncio.run(run())
+    assert llm.calls == 2
+    assert len(cache) == 0
+
+
+def test_successful_commands_are_cached():
+    cache = BoundedTTLCache(max_size=10, ttl=60)
+    llm = FakeLLM(result=[StartFlowCommand()])
+
+    async def run():
+        for _ in range(2):
+            await cache.get_or_compute("k", llm, should_cache=cacheable_commands)
+
+    asyncio.run(run())
+    assert llm.calls == 1
@@ -0,0 +1,81 @@
+import asyncio
+import urllib.parse
+
+import pytest
+
+from actions import action_catalog
+from actions.action_http_client import ApiResponse
+from actions.action_search_index import canonical_query
+
+
+@pytest.fixture(autouse=True)
+def clear_search_caches():
+    action_catalog.search_cache.invalidate()
+    action_catalog.negative_search_cache.invalidate()
+    yield
+    action_catalog.search_cache.invalidate()
+    action_catalog.negative_search_cache.invalidate()
+
+
+class FakeUpstream:
+    def __init__(self, names):
+        self.names = names
+        self.queries = []
+
+    async def __call__(self, url, **kwargs):
+        query = urllib.parse.parse_qs(urllib.parse.urlsplit(url).query)["searchByName"][0]
+        self.queries.append(query)
+        products = [{"_id": f"p{i}", "name": name} for i, name in enumerate(self.names)
+                    if query.lower() in name.lower()]
+        return ApiResponse(200, {"success": True, "data": {"products": products}})
+
+
+def test_canonical_query_ignores_case_punctuation_and_filler_words():
+    assert canonical_query("Ayam Bakar Madu") == "ayam bakar madu"
+    assert canonical_query("ayam bakar madu ") == "ayam bakar madu"
+    assert canonical_query("mau cari ayam bakar madu!") == "ayam bakar madu"
+    assert canonical_query("mau cari") == "mau cari"
+
+
+def test_upstream_receives_original_term_not_canonical_form(monkeypatch):
+    upstream = FakeUpstream(["Ayam Bakar Rica-Rica"])
+    monkeypatch.setattr(action_catalog, "fetch_json", upstream)
+
+    result = asyncio.run(action_catalog.search_products_upstream(" Ayam Bakar Rica-Rica "))
+
+    assert upstream.queries == ["Ayam Bakar Rica-Rica"]
+    assert [product.name for product in result.data["data"]["products"]] == ["Ayam Bakar Rica-Rica"]
+
+
+def test_spelling_variants_share_one_cache_entry(monkeypatch):
+    upstream = FakeUpstream(["Ayam Bakar Madu"])
+    monkeypatch.setattr(action_catalog, "fetch_json", upstream)
+
+    for term in ["Ayam Bakar Madu", "ayam bakar madu ", "ayam bakar madu!"]:
+        result = asyncio.run(action_catalog.search_products_upstream(term))
+        assert len(result.data["data"]["products"]) == 1
+
+    assert upstream.queries == ["Ayam Bakar Madu"]
+
+
+def test_empty_results_are_negatively_cached(monkeypatch):
+    upstream = FakeUpstream(["Ayam Bakar Madu"])
+    monkeypatch.setattr(action_catalog, "fetch_json", upstream)
+
+    for term in ["pizza", "Pizza", " PIZZA "]:
+        result = asyncio.run(action_catalog.search_products_upstream(term))
+        assert result.data["data"]["products"] == []
+
+    assert upstream.queries == ["pizza"]
+
+
+def test_miss_for_one_spelling_does_not_hide_another(monkeypatch):
+    upstream = FakeUpstream(["Ayam Bakar Rica-Rica"])
+    monkeypatch.setattr(action_catalog, "fetch_json", upstream)
+
+    missed = asyncio.run(action_catalog.search_products_upstream("ayam bakar rica rica"))
+    assert missed.data["data"]["products"] == []
+
+    found = asyncio.run(action_catalog.search_products_upstream("Ayam Bakar Rica-Rica"))
+    assert [product.name for product in found.data["data"]["products"]] == ["Ayam Bakar Rica-Rica"]
+    assert upstream.queries == ["ayam bakar rica rica", "Ayam Bakar Rica-Rica"]